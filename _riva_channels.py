@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Riva gRPC channels shared across sessions by the pipeline servers.
+
+Each pipecat Riva service opens its own TLS channel in __init__. With
+RIVA_SHARED_CHANNEL enabled, pipeline_modern.py and pipeline_only_asr.py
+swap that channel for one cached per endpoint/function.
+
+Example:
+    shared_auth = shared_riva_auth(server, function_id, api_key)
+    use_shared_riva_channel(stt._asr_service, shared_auth)
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=16)
+def shared_riva_auth(server: str, function_id: str, api_key: str):
+    """One Riva Auth (and gRPC channel) per endpoint, shared by all sessions.
+
+    NVCF routes on the function-id metadata baked into the channel's call
+    credentials, so a channel can only be shared by services calling the
+    same function: every STT session shares one, every TTS session another.
+
+    Args:
+        server: Riva gRPC endpoint (host:port)
+        function_id: NVCF function ID sent with every call
+        api_key: NGC API key for the Bearer header
+
+    Returns:
+        riva.client.Auth wrapping a TLS channel to the endpoint
+    """
+    import riva.client
+
+    return riva.client.Auth(
+        None,
+        True,
+        server,
+        [["function-id", function_id], ["authorization", f"Bearer {api_key}"]],
+    )
+
+
+def use_shared_riva_channel(riva_client_service, auth) -> bool:
+    """Point a Riva SDK service at a shared channel and close its own one.
+
+    The pipecat Riva services build their riva.client service (and channel)
+    in __init__, so the stub is rebuilt on the shared channel afterwards.
+
+    Args:
+        riva_client_service: riva.client ASRService/SpeechSynthesisService, or None
+        auth: Shared Auth from shared_riva_auth()
+
+    Returns:
+        True if the service now uses the shared channel
+    """
+    if riva_client_service is None or not hasattr(riva_client_service, "stub"):
+        return False
+    own_auth = getattr(riva_client_service, "auth", None)
+    if own_auth is auth:
+        return True
+    riva_client_service.auth = auth
+    riva_client_service.stub = type(riva_client_service.stub)(auth.channel)
+    own_channel = getattr(own_auth, "channel", None)
+    if own_channel is not None:
+        own_channel.close()
+    return True
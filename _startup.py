@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Command-line startup shared by the pipeline servers.
+
+pipeline_modern.py and pipeline_only_asr.py start the same way from their
+__main__ blocks: parse host/port/verbosity, configure loguru, log a
+banner, then serve the FastAPI app with uvicorn.
+
+Example:
+    args = parse_args("ASR-Only Pipeline (No TTS)")
+    configure_logging(args.verbose)
+    log_banner("🎤 ASR-Only Pipeline (No TTS)", {"Language": "en-US"})
+    serve(app, args.host, args.port)
+"""
+
+import argparse
+import sys
+
+import uvicorn
+from loguru import logger
+
+# Optional: uvloop event loop and httptools HTTP parser (both come with
+# uvicorn[standard]; uvloop isn't available on Windows)
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+BANNER_RULE = "=" * 70
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parse the --host, --port and --verbose options.
+
+    Args:
+        description: Help text for the server
+
+    Returns:
+        Parsed arguments (host, port, verbose)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host", default="0.0.0.0", help="Host address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=7860, help="Port number (default: 7860)")
+    parser.add_argument("--verbose", "-v", action="count", default=0, help="Increase logging verbosity")
+    return parser.parse_args()
+
+
+def configure_logging(verbosity: int):
+    """Replace loguru's default sink with one at INFO, DEBUG (-v) or TRACE (-vv).
+
+    Args:
+        verbosity: Number of -v flags
+    """
+    logger.remove(0)
+    if verbosity >= 2:
+        logger.add(sys.stderr, level="TRACE")
+    elif verbosity >= 1:
+        logger.add(sys.stderr, level="DEBUG")
+    else:
+        logger.add(sys.stderr, level="INFO")
+
+
+def log_banner(title: str, extras: dict[str, object]):
+    """Log the startup banner: a title and one "key: value" line per entry.
+
+    Args:
+        title: Server name shown between the rules
+        extras: Settings to show, in order
+    """
+    logger.info(BANNER_RULE)
+    logger.info(title)
+    logger.info(BANNER_RULE)
+    for key, value in extras.items():
+        logger.info("{}: {}", key, value)
+    logger.info(BANNER_RULE)
+
+
+def serve(app, host: str, port: int, access_log: bool = False):
+    """Run the app with uvicorn on uvloop/httptools when available.
+
+    Runs a single worker: pcs_map lives in this process, and ICE PATCHes
+    must reach the worker holding the connection. Scale out with more
+    processes/ports.
+
+    Args:
+        app: FastAPI application
+        host: Bind address
+        port: Bind port
+        access_log: Log a line per HTTP request
+    """
+    loop_impl = "uvloop" if UVLOOP_AVAILABLE else "asyncio"
+    http_impl = "httptools" if HTTPTOOLS_AVAILABLE else "h11"
+    logger.info("Event loop: {}, HTTP parser: {}", loop_impl, http_impl)
+    logger.info("🌐 Server starting on http://{}:{}", host, port)
+
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop=loop_impl,
+        http=http_impl,
+        access_log=access_log,
+    )
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Precompressed, cacheable static UI serving shared by the pipeline servers.
+
+pipeline_modern.py and pipeline_asr_agent.py mount the Vite build in
+ui/dist the same way: precompress its text assets once at startup, then
+serve them with CachedStaticFiles.
+
+Example:
+    precompress_static_files(UI_DIST_DIR)
+    app.mount("/app", CachedStaticFiles(directory=str(UI_DIST_DIR), html=True))
+"""
+
+import gzip
+import mimetypes
+import os
+from pathlib import Path
+
+from fastapi.responses import FileResponse, Response
+from fastapi.staticfiles import StaticFiles
+from loguru import logger
+from starlette.datastructures import Headers
+
+# Optional: brotli for precompressed .br UI assets (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Text assets worth precompressing; images/fonts are already compressed
+PRECOMPRESS_SUFFIXES = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+PRECOMPRESS_MIN_SIZE = 1024
+
+
+def precompress_static_files(directory: Path) -> int:
+    """Write .gz (and .br if brotli is installed) siblings for text assets.
+
+    Existing up-to-date siblings are left alone, and a read-only directory
+    just means assets are served uncompressed.
+
+    Args:
+        directory: Static files root (e.g. the Vite dist directory)
+
+    Returns:
+        Number of compressed files written
+    """
+    written = 0
+    encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9))]
+    if BROTLI_AVAILABLE:
+        encoders.append((".br", brotli.compress))
+
+    for path in directory.rglob("*"):
+        if path.suffix not in PRECOMPRESS_SUFFIXES or not path.is_file():
+            continue
+        stat = path.stat()
+        if stat.st_size < PRECOMPRESS_MIN_SIZE:
+            continue
+        data = None
+        for suffix, encode in encoders:
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= stat.st_mtime:
+                continue
+            if data is None:
+                data = path.read_bytes()
+            try:
+                target.write_bytes(encode(data))
+                written += 1
+            except OSError as e:
+                logger.debug("Could not precompress {}: {}", path, e)
+                return written
+    return written
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants and caches hashed assets.
+
+    Vite emits content-hashed filenames under assets/, so those responses are
+    marked immutable and browsers stop revalidating them. When the client
+    accepts br/gzip and a precompressed sibling exists, it is served directly
+    (still via FileResponse, so the kernel sendfile path is kept).
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+
+        response = None
+        for encoding, suffix in self.ENCODINGS:
+            if encoding not in accept_encoding:
+                continue
+            try:
+                compressed_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            response = FileResponse(
+                full_path + suffix,
+                status_code=status_code,
+                stat_result=compressed_stat,
+                media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+            )
+            response.headers["Content-Encoding"] = encoding
+            break
+
+        if response is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        if f"{os.sep}assets{os.sep}" in full_path:
+            response.headers["Cache-Control"] = self.IMMUTABLE_CACHE_CONTROL
+        return response
@@ -14,7 +14,9 @@ from typing import Any, Optional
 import os
 from dotenv import load_dotenv
 
+import httpx
 from langgraph_sdk import get_client
+from langgraph_sdk.client import LangGraphClient
 from langchain_core.messages import HumanMessage
 from loguru import logger
 from pipecat.frames.frames import (
@@ -66,6 +68,9 @@ class LangGraphLLMService(OpenAILLMService):
         user_email: Value for `configurable.user_email` (routing / personalization).
         stream_mode: SDK stream mode ("updates", "values", "messages", "events").
         debug_stream: When True, logs raw stream events for troubleshooting.
+        http_client: Optional shared httpx.AsyncClient (with base_url set) so
+            pooled keep-alive connections are reused across sessions. The
+            service does not close it.
     """
 
     def __init__(
@@ -78,6 +83,7 @@ class LangGraphLLMService(OpenAILLMService):
         debug_stream: bool = False,
         thread_id: Optional[str] = None,
         auth_token: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
         **kwargs: Any,
     ) -> None:
         # Initialize base class; OpenAI settings unused but required by parent
@@ -97,7 +103,10 @@ class LangGraphLLMService(OpenAILLMService):
         )
 
         headers = {"Authorization": f"Bearer {token}"} if isinstance(token, str) and token else None
-        self._client = get_client(url=self.base_url, headers=headers) if headers else get_client(url=self.base_url)
+        if http_client is not None:
+            self._client = LangGraphClient(http_client)
+        else:
+            self._client = get_client(url=self.base_url, headers=headers) if headers else get_client(url=self.base_url)
         self._thread_id: Optional[str] = thread_id
         self._current_task: Optional[asyncio.Task] = None
         self._outer_open: bool = False
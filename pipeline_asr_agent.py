@@ -62,20 +62,28 @@ agents to access these values in their graph logic.
 import argparse
 import asyncio
 import base64
+import itertools
 import json
 import os
 import sys
-import uuid
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+import httpx
+import langgraph_sdk
+import orjson
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from loguru import logger
+from websockets.exceptions import ConnectionClosed
 from pipecat_ai_small_webrtc_prebuilt.frontend import SmallWebRTCPrebuiltUI
 
 from pipecat.frames.frames import (
@@ -102,6 +110,8 @@ from pipecat.transports.smallwebrtc.connection import (
 from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
 
+from _static_files import CachedStaticFiles, precompress_static_files
+
 # Use the ASR-agent specific version that wraps input in {"messages": [...]} dict
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -115,7 +125,121 @@ LangGraphLLMService = langgraph_llm_service_asr.LangGraphLLMService
 
 load_dotenv(override=True)
 
-app = FastAPI()
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Process-wide configuration, read from the environment once at import.
+    
+    Per-request overrides (assistant, language, LangGraph URL) still come
+    from the client; these are the env defaults they fall back to.
+    """
+    langgraph_url: str
+    langgraph_assistant: str
+    langgraph_stream_mode: str
+    langgraph_debug_stream: bool
+    langgraph_auth_token: Optional[str]
+    langgraph_api_key: Optional[str]
+    user_email: str
+    nvidia_key: Optional[str]
+    riva_url: str
+    asr_function_id: str
+    asr_model: str
+    asr_language: str
+    asr_custom_config: str
+    asr_auto_punctuation: bool
+    asr_profanity_filter: bool
+    sample_rate: int
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables."""
+        return cls(
+            langgraph_url=os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024"),
+            langgraph_assistant=os.getenv("LANGGRAPH_ASSISTANT", "simple_agent"),
+            langgraph_stream_mode=os.getenv("LANGGRAPH_STREAM_MODE", "messages"),
+            langgraph_debug_stream=os.getenv("LANGGRAPH_DEBUG_STREAM", "false").lower() == "true",
+            langgraph_auth_token=(
+                os.getenv("LANGGRAPH_AUTH_TOKEN")
+                or os.getenv("AUTH0_ACCESS_TOKEN")
+                or os.getenv("AUTH_BEARER_TOKEN")
+            ),
+            # Same precedence as langgraph_sdk.get_client()
+            langgraph_api_key=(
+                os.getenv("LANGGRAPH_API_KEY")
+                or os.getenv("LANGSMITH_API_KEY")
+                or os.getenv("LANGCHAIN_API_KEY")
+            ),
+            user_email=os.getenv("USER_EMAIL", "test@example.com"),
+            nvidia_key=os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY"),
+            riva_url=os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443"),
+            asr_function_id=os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409"),
+            asr_model=os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble"),
+            asr_language=os.getenv("RIVA_ASR_LANGUAGE", "en-US"),
+            asr_custom_config=os.getenv(
+                "RIVA_ASR_CUSTOM_CONFIG",
+                "enable_vad_endpointing:true,neural_vad.onset:0.65,apply_partial_itn:true",
+            ),
+            asr_auto_punctuation=os.getenv("RIVA_ASR_AUTO_PUNCTUATION", "true").lower() == "true",
+            asr_profanity_filter=os.getenv("RIVA_ASR_PROFANITY_FILTER", "false").lower() == "true",
+            sample_rate=int(os.getenv("AUDIO_SAMPLE_RATE", "16000")),
+        )
+
+
+SETTINGS = Settings.from_env()
+
+# Optional: HTTP/2 for the shared LangGraph client (needs the h2 package)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Keep-alive pool shared by every LangGraph call in this process
+LANGGRAPH_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+# Agent runs stream for a while between chunks, so only the read timeout is long
+LANGGRAPH_HTTP_TIMEOUT = httpx.Timeout(30.0, read=300.0)
+
+
+def build_langgraph_http_client() -> httpx.AsyncClient:
+    """Create the process-wide HTTP client for the default LangGraph server.
+    
+    The client bypasses langgraph_sdk.get_client(), so it sets the headers
+    the SDK would: its User-Agent and x-api-key for LangGraph Platform.
+    
+    Returns:
+        httpx.AsyncClient with base_url, auth headers and pool limits set
+    """
+    headers = {"User-Agent": f"langgraph-sdk-py/{langgraph_sdk.__version__}"}
+    if SETTINGS.langgraph_api_key:
+        headers["x-api-key"] = SETTINGS.langgraph_api_key.strip().strip('"').strip("'")
+    if SETTINGS.langgraph_auth_token:
+        headers["Authorization"] = f"Bearer {SETTINGS.langgraph_auth_token}"
+    return httpx.AsyncClient(
+        base_url=SETTINGS.langgraph_url.rstrip("/"),
+        headers=headers,
+        http2=HTTP2_AVAILABLE,
+        limits=LANGGRAPH_HTTP_LIMITS,
+        timeout=LANGGRAPH_HTTP_TIMEOUT,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # Log unhandled task exceptions through loguru
+    asyncio.get_running_loop().set_exception_handler(_log_loop_exception)
+    
+    app.state.http = build_langgraph_http_client()
+    logger.info(f"🔌 Shared LangGraph HTTP client ready (http2={HTTP2_AVAILABLE})")
+    try:
+        yield
+    finally:
+        # Drain sessions so clients see a clean close instead of an ICE timeout
+        await close_all_connections()
+        await app.state.http.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -125,11 +249,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store connections, contexts, and configs by pc_id
-pcs_map: dict[str, SmallWebRTCConnection] = {}
-contexts_map: dict[str, OpenAILLMContext] = {}
-configs_map: dict[str, dict] = {}  # Store agent-specific config per session
-llm_services_map: dict[str, LangGraphLLMService] = {}  # Store LLM service instance per session
+# Compress JSON/text responses (SDP answers, /rtc-config, /assistants).
+# Bodies that already carry Content-Encoding (precompressed UI assets) are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+
+@dataclass(eq=False)
+class ConnState:
+    """Everything the server tracks for one WebRTC session."""
+
+    connection: SmallWebRTCConnection
+    context: Optional[OpenAILLMContext] = None
+    config: Optional[dict] = None  # Agent-specific config per session
+    llm_service: Optional[LangGraphLLMService] = None
+
+
+# Session state by pc_id, one entry per connection.
+# Weak values: the connection's "closed" handler owns the ConnState, so an
+# entry vanishes once the connection is garbage collected and a missed
+# "closed" event cannot leak session state. handle_disconnected still pops
+# explicitly for prompt cleanup.
+state_map: "weakref.WeakValueDictionary[str, ConnState]" = weakref.WeakValueDictionary()
+
+
+def register_connection(connection: SmallWebRTCConnection) -> ConnState:
+    """Create and store the session state for a newly initialized connection.
+
+    Args:
+        connection: Initialized SmallWebRTCConnection
+
+    Returns:
+        The ConnState stored in state_map under the connection's pc_id
+    """
+    state = ConnState(connection=connection)
+    state_map[connection.pc_id] = state
+
+    # Setup disconnect handler (its closure keeps the state alive)
+    @connection.event_handler("closed")
+    async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
+        logger.info(f"Connection closed for pc_id: {webrtc_connection.pc_id}")
+        if state_map.get(webrtc_connection.pc_id) is state:
+            del state_map[webrtc_connection.pc_id]
+        logger.debug(f"Active sessions: {len(state_map)}")
+
+    return state
+
+
+async def close_all_connections():
+    """Disconnect every live WebRTC session concurrently (used on shutdown)."""
+    connections = [state.connection for state in list(state_map.values())]
+    if not connections:
+        return
+    logger.info(f"🔻 Closing {len(connections)} WebRTC connection(s)")
+    results = await asyncio.gather(
+        *(connection.disconnect() for connection in connections),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Error closing connection during shutdown: {result}")
+
+
+# Cached ICE servers shared by /rtc-config and new WebRTC connections
+# (refreshed every ICE_CACHE_TTL seconds so rotating TURN credentials stay valid)
+ICE_CACHE_TTL = float(os.getenv("ICE_CACHE_TTL", "300"))
+_ice_cache: dict = {"client": None, "server": None, "expires": 0.0}
+_ice_cache_lock = asyncio.Lock()
+
+# Bound concurrent agent pipelines so a connect storm applies backpressure
+# instead of spawning unbounded tasks
+MAX_CONCURRENT_AGENTS = int(os.getenv("MAX_CONCURRENT_AGENTS", "128"))
+_agent_sem = asyncio.Semaphore(MAX_CONCURRENT_AGENTS)
+_agent_tasks: set[asyncio.Task] = set()  # Strong refs so running tasks aren't GC'd
+
+# Max inbound UI messages dispatched per /ws loop iteration
+WS_DRAIN_BATCH = 32
+
+# Per-process stream ids for log correlation (no urandom syscall per session)
+_stream_counter = itertools.count()
 
 
 def get_language_from_string(lang_str: str):
@@ -222,14 +419,20 @@ def build_client_ice_servers() -> list[dict]:
     return servers
 
 
-def build_server_ice_servers() -> list[IceServer]:
+def build_server_ice_servers(client_servers: Optional[list[dict]] = None) -> list[IceServer]:
     """Convert client ICE configs to server IceServer objects.
     
+    Args:
+        client_servers: Client ICE configs to convert (built fresh if omitted)
+    
     Returns:
         List of IceServer objects for Pipecat transport
     """
+    if client_servers is None:
+        client_servers = build_client_ice_servers()
+    
     out: list[IceServer] = []
-    for s in build_client_ice_servers():
+    for s in client_servers:
         urls = s.get("urls")
         username = s.get("username", "")
         credential = s.get("credential", "")
@@ -244,13 +447,38 @@ def build_server_ice_servers() -> list[IceServer]:
     return out
 
 
+async def get_ice_servers() -> dict:
+    """Return cached ICE servers, rebuilding them at most once per ICE_CACHE_TTL.
+    
+    Returns:
+        Cache dict with "client" ({"iceServers": [...]} for browsers) and
+        "server" (IceServer list shared by new SmallWebRTCConnections)
+    """
+    if time.monotonic() < _ice_cache["expires"]:
+        return _ice_cache
+    
+    async with _ice_cache_lock:
+        # Another request may have refreshed the cache while we waited
+        now = time.monotonic()
+        if now < _ice_cache["expires"]:
+            return _ice_cache
+        
+        # Twilio's token call is blocking HTTP; keep it off the event loop
+        client_servers = await asyncio.to_thread(build_client_ice_servers)
+        _ice_cache["client"] = {"iceServers": client_servers}
+        _ice_cache["server"] = build_server_ice_servers(client_servers)
+        _ice_cache["expires"] = now + ICE_CACHE_TTL
+        return _ice_cache
+
+
 async def run_asr_agent(
     webrtc_connection: SmallWebRTCConnection,
     ws: Optional[WebSocket] = None,
     assistant_override: Optional[str] = None,
     language_override: Optional[str] = None,
     langgraph_url_override: Optional[str] = None,
-    agent_config: Optional[dict] = None
+    agent_config: Optional[dict] = None,
+    http_client: Optional[httpx.AsyncClient] = None
 ):
     """Run ASR + Agent pipeline with text-only output (no TTS).
     
@@ -262,8 +490,9 @@ async def run_asr_agent(
         langgraph_url_override: Optional LangGraph URL override from client
         agent_config: Optional agent-specific configuration dict with 'configurable' and 'metadata' keys
                      Example: {"configurable": {"book_id": "123"}, "metadata": {"user_id": "user@example.com"}}
+        http_client: Optional shared client for the default LangGraph server (app.state.http)
     """
-    stream_id = uuid.uuid4()
+    stream_id = f"{os.getpid()}-{next(_stream_counter)}"
     
     logger.info("=" * 80)
     logger.info(f"🚀 Starting ASR + Agent Pipeline (Text-Only) (stream_id: {stream_id})")
@@ -280,7 +509,7 @@ async def run_asr_agent(
         logger.info(f"⚙️  Agent config from client: {agent_config}")
     
     # Transport configuration
-    sample_rate = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+    sample_rate = SETTINGS.sample_rate
     
     # Configure VAD (Voice Activity Detection) parameters
     logger.info("")
@@ -311,21 +540,29 @@ async def run_asr_agent(
     )
     
     # LangGraph LLM Service with metadata
-    selected_assistant = assistant_override or os.getenv("LANGGRAPH_ASSISTANT", "simple_agent")
-    langgraph_base_url = langgraph_url_override or os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024")
+    selected_assistant = assistant_override or SETTINGS.langgraph_assistant
+    langgraph_base_url = langgraph_url_override or SETTINGS.langgraph_url
     
     logger.info("")
     logger.info("🤖 LANGGRAPH CONFIGURATION:")
     logger.info(f"   • Assistant ID: '{selected_assistant}'")
     logger.info(f"   • Base URL: {langgraph_base_url}")
     logger.info(f"   • Override from client: {assistant_override or 'None'}")
-    logger.info(f"   • From env (LANGGRAPH_ASSISTANT): {os.getenv('LANGGRAPH_ASSISTANT', 'simple_agent')}")
+    logger.info(f"   • From env (LANGGRAPH_ASSISTANT): {SETTINGS.langgraph_assistant}")
     
-    # Verify assistant exists (optional check)
+    # The shared client is bound to the env LangGraph URL; a client-supplied
+    # URL gets its own client
+    if langgraph_base_url != SETTINGS.langgraph_url:
+        http_client = None
+    
+    # Verify assistant exists (optional check) - pooled, non-blocking request
     try:
-        import requests
-        resp = requests.get(f"{langgraph_base_url}/assistants", timeout=5)
-        if resp.ok:
+        if http_client is not None:
+            resp = await http_client.get("/assistants", timeout=5)
+        else:
+            async with httpx.AsyncClient(base_url=langgraph_base_url) as probe_client:
+                resp = await probe_client.get("/assistants", timeout=5)
+        if resp.is_success:
             assistants_data = resp.json()
             if isinstance(assistants_data, list):
                 assistant_ids = [a.get('assistant_id') or a.get('id') or a for a in assistants_data]
@@ -346,12 +583,13 @@ async def run_asr_agent(
     llm = LangGraphLLMService(
         base_url=langgraph_base_url,
         assistant=selected_assistant,
-        user_email=os.getenv("USER_EMAIL", "test@example.com"),
-        stream_mode=os.getenv("LANGGRAPH_STREAM_MODE", "messages"),  # Use 'messages' for token streaming
-        debug_stream=os.getenv("LANGGRAPH_DEBUG_STREAM", "false").lower() == "true",
+        user_email=SETTINGS.user_email,
+        stream_mode=SETTINGS.langgraph_stream_mode,  # Use 'messages' for token streaming
+        debug_stream=SETTINGS.langgraph_debug_stream,
+        http_client=http_client,
     )
-    logger.info(f"   • Stream mode: {os.getenv('LANGGRAPH_STREAM_MODE', 'messages')}")
-    logger.info(f"   • User email: {os.getenv('USER_EMAIL', 'test@example.com')}")
+    logger.info(f"   • Stream mode: {SETTINGS.langgraph_stream_mode}")
+    logger.info(f"   • User email: {SETTINGS.user_email}")
     
     # Set runtime config on LLM service if provided
     if agent_config:
@@ -363,13 +601,13 @@ async def run_asr_agent(
     # NVIDIA Riva STT (Speech-to-Text)
     logger.info("🎤 Creating Riva STT service...")
     
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY")
+    nvidia_api_key = SETTINGS.nvidia_key
     if not nvidia_api_key:
         raise ValueError("NVIDIA_API_KEY or NVIDIA_ASR_API_KEY required")
     
-    asr_function_id = os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409")
-    asr_model_name = os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble")
-    asr_server = os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443")
+    asr_function_id = SETTINGS.asr_function_id
+    asr_model_name = SETTINGS.asr_model
+    asr_server = SETTINGS.riva_url
     
     logger.info(f"   🔑 NGC API Key: {nvidia_api_key[:10]}...{nvidia_api_key[-8:]}")
     logger.info(f"   🆔 Function ID: {asr_function_id}")
@@ -377,7 +615,7 @@ async def run_asr_agent(
     logger.info(f"   📦 Model: {asr_model_name}")
     
     # Language configuration
-    env_language = os.getenv("RIVA_ASR_LANGUAGE", "en-US")
+    env_language = SETTINGS.asr_language
     language_code = language_override or env_language
     
     logger.info("")
@@ -392,8 +630,7 @@ async def run_asr_agent(
     stt_params_language = Language.EN_US if enable_language_detection else stt_language
     
     # Custom ASR configuration
-    custom_config = os.getenv("RIVA_ASR_CUSTOM_CONFIG", 
-                              "enable_vad_endpointing:true,neural_vad.onset:0.65,apply_partial_itn:true")
+    custom_config = SETTINGS.asr_custom_config
     
     if enable_language_detection:
         if custom_config:
@@ -420,8 +657,8 @@ async def run_asr_agent(
         ),
         custom_configuration=custom_config,
         interim_results=True,
-        automatic_punctuation=os.getenv("RIVA_ASR_AUTO_PUNCTUATION", "true").lower() == "true",
-        profanity_filter=os.getenv("RIVA_ASR_PROFANITY_FILTER", "false").lower() == "true",
+        automatic_punctuation=SETTINGS.asr_auto_punctuation,
+        profanity_filter=SETTINGS.asr_profanity_filter,
     )
     
     logger.info(f"   ✅ Riva STT Service created")
@@ -433,11 +670,15 @@ async def run_asr_agent(
     
     # Store context, config, and LLM service for session access
     pc_id = webrtc_connection.pc_id
-    contexts_map[pc_id] = context
-    llm_services_map[pc_id] = llm
-    if agent_config:
-        configs_map[pc_id] = agent_config
-        logger.info(f"   Stored config for session {pc_id}")
+    state = state_map.get(pc_id)
+    if state is not None:
+        state.context = context
+        state.llm_service = llm
+        if agent_config:
+            state.config = agent_config
+            logger.info(f"   Stored config for session {pc_id}")
+    else:
+        logger.warning(f"No session state for pc_id: {pc_id}")
     
     # Create context aggregator
     context_aggregator = llm.create_context_aggregator(context)
@@ -491,6 +732,45 @@ async def run_asr_agent(
     await runner.run(task)
 
 
+async def run_asr_agent_bounded(*args, **kwargs):
+    """Run run_asr_agent once a MAX_CONCURRENT_AGENTS slot is free."""
+    async with _agent_sem:
+        await run_asr_agent(*args, **kwargs)
+
+
+def _on_agent_task_done(task: asyncio.Task):
+    """Drop a finished agent task and log its exception, if any."""
+    _agent_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error(f"Agent task {task.get_name()} failed")
+
+
+def launch_agent(pc_id: str, *args) -> asyncio.Task:
+    """Start a bounded, tracked agent pipeline task for a connection.
+    
+    Args:
+        pc_id: Connection id, used for the task name
+        *args: Positional arguments for run_asr_agent
+        
+    Returns:
+        The created task
+    """
+    task = asyncio.create_task(run_asr_agent_bounded(*args), name=f"agent-{pc_id}")
+    _agent_tasks.add(task)
+    task.add_done_callback(_on_agent_task_done)
+    return task
+
+
+def _log_loop_exception(loop: asyncio.AbstractEventLoop, context: dict):
+    """Event loop exception handler: route unhandled task errors to loguru."""
+    exception = context.get("exception")
+    message = context.get("message", "Unhandled exception in event loop")
+    if exception is not None:
+        logger.opt(exception=exception).error(message)
+    else:
+        logger.error(message)
+
+
 @app.post("/api/offer")
 async def api_offer(
     request: dict, 
@@ -530,13 +810,17 @@ async def api_offer(
             }
         }
     """
-    logger.info("=" * 80)
-    logger.info(f"📞 API /api/offer REQUEST:")
-    logger.info(f"   • Body keys: {list(request.keys())}")
-    logger.info(f"   • Query - language: {language}")
-    logger.info(f"   • Query - assistant: {assistant}")
-    logger.info(f"   • Query - langgraph_url: {langgraph_url}")
-    logger.info("=" * 80)
+    logger.opt(lazy=True).info(
+        "📞 API /api/offer REQUEST:\n"
+        "   • Body keys: {}\n"
+        "   • Query - language: {}\n"
+        "   • Query - assistant: {}\n"
+        "   • Query - langgraph_url: {}",
+        lambda: list(request.keys()),
+        lambda: language,
+        lambda: assistant,
+        lambda: langgraph_url,
+    )
     
     pc_id = request.get("pc_id")
     
@@ -557,15 +841,22 @@ async def api_offer(
         except Exception as e:
             logger.warning(f"   ⚠️  Failed to decode config_b64: {e}")
     
-    logger.info(f"   • pc_id: {pc_id}")
-    logger.info(f"   • assistant: {assistant_from_client or 'default'}")
-    logger.info(f"   • language: {language_from_client or 'default'}")
-    logger.info(f"   • langgraph_url: {langgraph_url_from_client or 'default'}")
-    logger.info(f"   • agent_config: {agent_config_from_client or 'None'}")
+    logger.info(
+        "   • pc_id: {}\n"
+        "   • assistant: {}\n"
+        "   • language: {}\n"
+        "   • langgraph_url: {}\n"
+        "   • agent_config: {}",
+        pc_id,
+        assistant_from_client or "default",
+        language_from_client or "default",
+        langgraph_url_from_client or "default",
+        agent_config_from_client or "None",
+    )
     
-    if pc_id and pc_id in pcs_map:
+    if pc_id and pc_id in state_map:
         # Reuse existing connection
-        pipecat_connection = pcs_map[pc_id]
+        pipecat_connection = state_map[pc_id].connection
         logger.info(f"Reusing existing connection for pc_id: {pc_id}")
         await pipecat_connection.renegotiate(
             sdp=request["sdp"],
@@ -574,33 +865,24 @@ async def api_offer(
         )
     else:
         # Create new WebRTC connection
-        ice_servers = build_server_ice_servers()
+        ice_servers = (await get_ice_servers())["server"]
         pipecat_connection = SmallWebRTCConnection(ice_servers)
         await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
-        
-        # Setup disconnect handler
-        @pipecat_connection.event_handler("closed")
-        async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-            logger.info(f"Connection closed for pc_id: {webrtc_connection.pc_id}")
-            pcs_map.pop(webrtc_connection.pc_id, None)
-            contexts_map.pop(webrtc_connection.pc_id, None)
-            configs_map.pop(webrtc_connection.pc_id, None)
-            llm_services_map.pop(webrtc_connection.pc_id, None)
+        register_connection(pipecat_connection)
         
         # Start pipeline in background
         background_tasks.add_task(
-            run_asr_agent,
+            run_asr_agent_bounded,
             pipecat_connection,
             None,
             assistant_from_client,
             language_from_client,
             langgraph_url_from_client,
-            agent_config_from_client
+            agent_config_from_client,
+            app.state.http,
         )
     
-    # Get answer and store connection
     answer = pipecat_connection.get_answer()
-    pcs_map[answer["pc_id"]] = pipecat_connection
     
     return JSONResponse(answer)
 
@@ -617,11 +899,12 @@ async def api_offer_patch(request: dict):
     """
     pc_id = request.get("pc_id")
     
-    if not pc_id or pc_id not in pcs_map:
+    state = state_map.get(pc_id) if pc_id else None
+    if state is None:
         logger.warning(f"PATCH request for unknown pc_id: {pc_id}")
         return JSONResponse({"error": "Connection not found"}, status_code=404)
     
-    pipecat_connection = pcs_map[pc_id]
+    pipecat_connection = state.connection
     
     # Handle ICE candidate if provided
     if "candidate" in request:
@@ -649,7 +932,7 @@ async def list_assistants(request: Request):
     Returns:
         List of assistant configurations with display names
     """
-    import requests
+    http = request.app.state.http
     
     # Custom display name mappings
     DISPLAY_NAME_OVERRIDES = {
@@ -664,20 +947,9 @@ async def list_assistants(request: Request):
         "healthcare_agent": "Healthcare: Telehealth Nurse",
     }
     
-    base_url = os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024").rstrip("/")
-    
-    # Auth handling
+    # Auth handling (the shared client already sends the env token)
     inbound_auth = request.headers.get("authorization")
-    token = (
-        os.getenv("LANGGRAPH_AUTH_TOKEN")
-        or os.getenv("AUTH0_ACCESS_TOKEN")
-        or os.getenv("AUTH_BEARER_TOKEN")
-    )
-    headers = (
-        {"Authorization": inbound_auth}
-        if inbound_auth
-        else {"Authorization": f"Bearer {token}"} if token else None
-    )
+    headers = {"Authorization": inbound_auth} if inbound_auth else None
     
     def normalize_entries(raw_items: list) -> list[dict]:
         """Normalize assistant entries from various API formats."""
@@ -699,13 +971,13 @@ async def list_assistants(request: Request):
     # Try GET /assistants
     items: list[dict] = []
     try:
-        resp = requests.get(
-            f"{base_url}/assistants",
+        resp = await http.get(
+            "/assistants",
             params={"limit": 100},
             timeout=8,
             headers=headers
         )
-        if resp.ok:
+        if resp.is_success:
             data = resp.json() or []
             if isinstance(data, dict):
                 data = data.get("items") or data.get("results") or data.get("assistants") or []
@@ -717,8 +989,8 @@ async def list_assistants(request: Request):
     # Fallback: POST /assistants/search
     if not items:
         try:
-            resp = requests.post(
-                f"{base_url}/assistants/search",
+            resp = await http.post(
+                "/assistants/search",
                 json={
                     "metadata": {},
                     "limit": 100,
@@ -727,7 +999,7 @@ async def list_assistants(request: Request):
                 timeout=10,
                 headers=headers,
             )
-            if resp.ok:
+            if resp.is_success:
                 data = resp.json() or []
                 if isinstance(data, dict):
                     data = data.get("items") or data.get("results") or []
@@ -745,12 +1017,12 @@ async def list_assistants(request: Request):
         if assistant_id:
             # Try to get more details
             try:
-                resp = requests.get(
-                    f"{base_url}/assistants/{assistant_id}",
+                resp = await http.get(
+                    f"/assistants/{assistant_id}",
                     timeout=5,
                     headers=headers
                 )
-                if resp.ok:
+                if resp.is_success:
                     d = resp.json() or {}
                     detail.update({
                         "graph_id": d.get("graph_id"),
@@ -781,6 +1053,19 @@ async def list_assistants(request: Request):
     return enriched
 
 
+async def _read_ws_messages(websocket: WebSocket, queue: asyncio.Queue):
+    """Feed inbound WebSocket text frames into a queue.
+    
+    Receive errors (including disconnects) are queued as well, so the
+    consumer handles them in order after any messages that preceded them.
+    """
+    try:
+        while True:
+            queue.put_nowait(await websocket.receive_text())
+    except Exception as e:
+        queue.put_nowait(e)
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for ASR + Agent with optional control messages.
@@ -799,77 +1084,97 @@ async def websocket_endpoint(websocket: WebSocket):
         langgraph_url_from_client = request.get("langgraph_url")
         agent_config_from_client = request.get("config")  # Agent-specific config
         
-        logger.info("=" * 80)
-        logger.info(f"📞 WebSocket /ws connection:")
-        logger.info(f"   • pc_id: {pc_id}")
-        logger.info(f"   • assistant: {assistant_from_client or 'default'}")
-        logger.info(f"   • language: {language_from_client or 'default'}")
-        logger.info(f"   • langgraph_url: {langgraph_url_from_client or 'default'}")
-        logger.info(f"   • agent_config: {agent_config_from_client or 'None'}")
-        logger.info("=" * 80)
+        # Single deferred-format call: loguru skips formatting when INFO is filtered
+        logger.info(
+            "📞 WebSocket /ws connection:\n"
+            "   • pc_id: {}\n"
+            "   • assistant: {}\n"
+            "   • language: {}\n"
+            "   • langgraph_url: {}\n"
+            "   • agent_config: {}",
+            pc_id,
+            assistant_from_client or "default",
+            language_from_client or "default",
+            langgraph_url_from_client or "default",
+            agent_config_from_client or "None",
+        )
         
-        if pc_id and pc_id in pcs_map:
+        if pc_id and pc_id in state_map:
             # Reuse existing connection
-            pipecat_connection = pcs_map[pc_id]
+            pipecat_connection = state_map[pc_id].connection
             logger.info(f"Reusing existing connection for pc_id: {pc_id}")
             await pipecat_connection.renegotiate(sdp=request["sdp"], type=request["type"])
         else:
             # Create new WebRTC connection
-            ice_servers = build_server_ice_servers()
+            ice_servers = (await get_ice_servers())["server"]
             pipecat_connection = SmallWebRTCConnection(ice_servers)
             await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
-            
-            # Setup disconnect handler
-            @pipecat_connection.event_handler("closed")
-            async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-                logger.info(f"Connection closed for pc_id: {webrtc_connection.pc_id}")
-                pcs_map.pop(webrtc_connection.pc_id, None)
-                contexts_map.pop(webrtc_connection.pc_id, None)
-                configs_map.pop(webrtc_connection.pc_id, None)
-                llm_services_map.pop(webrtc_connection.pc_id, None)
+            register_connection(pipecat_connection)
             
             # Start pipeline
-            asyncio.create_task(
-                run_asr_agent(
-                    pipecat_connection,
-                    websocket,
-                    assistant_from_client,
-                    language_from_client,
-                    langgraph_url_from_client,
-                    agent_config_from_client
-                )
+            launch_agent(
+                pipecat_connection.pc_id,
+                pipecat_connection,
+                websocket,
+                assistant_from_client,
+                language_from_client,
+                langgraph_url_from_client,
+                agent_config_from_client,
+                websocket.app.state.http,
             )
         
         # Send answer back to client
         answer = pipecat_connection.get_answer()
-        pcs_map[answer["pc_id"]] = pipecat_connection
-        await websocket.send_json(answer)
+        # The browser parses event.data as a string, so keep a TEXT frame
+        await websocket.send_text(orjson.dumps(answer).decode())
         
-        # Keep connection alive and handle messages
-        while True:
-            try:
-                message = await websocket.receive_text()
-                
-                # Parse JSON messages from UI
+        # Keep connection alive and handle messages.
+        # A background reader queues inbound frames so bursts from the UI
+        # are drained and dispatched in one pass instead of one await each.
+        inbound: asyncio.Queue = asyncio.Queue()
+        reader_task = asyncio.create_task(_read_ws_messages(websocket, inbound))
+        
+        try:
+            while True:
                 try:
-                    data = json.loads(message)
-                    msg_type = data.get("type")
-                    msg_content = data.get("message", "").strip()
+                    batch = [await inbound.get()]
+                    while len(batch) < WS_DRAIN_BATCH and not inbound.empty():
+                        batch.append(inbound.get_nowait())
                     
-                    if msg_type == "text_input" and msg_content:
-                        # Handle text input from UI
-                        logger.info(f"Text input from UI: {msg_content}")
-                        pc_id = pipecat_connection.pc_id
-                        if pc_id in contexts_map:
-                            context = contexts_map[pc_id]
-                            context.add_message({"role": "user", "content": msg_content})
-                
-                except json.JSONDecodeError:
-                    logger.debug(f"Non-JSON message received: {message}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing WebSocket message: {e}")
-                break
+                    for message in batch:
+                        if isinstance(message, Exception):
+                            raise message
+                        
+                        # UI control messages are JSON objects; skip anything else
+                        # without paying for a parse + JSONDecodeError
+                        if not (message and message[0] == "{"):
+                            logger.debug(f"Non-JSON message received: {message}")
+                            continue
+                        
+                        # Parse JSON messages from UI
+                        try:
+                            data = orjson.loads(message)
+                            msg_type = data.get("type")
+                            msg_content = data.get("message", "").strip()
+                            
+                            if msg_type == "text_input" and msg_content:
+                                # Handle text input from UI
+                                logger.info(f"Text input from UI: {msg_content}")
+                                pc_id = pipecat_connection.pc_id
+                                state = state_map.get(pc_id)
+                                if state is not None and state.context is not None:
+                                    state.context.add_message({"role": "user", "content": msg_content})
+                        
+                        except (orjson.JSONDecodeError, json.JSONDecodeError):
+                            # Only reached for malformed objects, not plain-text frames
+                            logger.debug(f"Malformed JSON message received: {message}")
+                        
+                except (WebSocketDisconnect, ConnectionClosed):
+                    # Normal exit; anything else is a real bug and reaches the outer handler
+                    logger.info("Client disconnected from WebSocket")
+                    break
+        finally:
+            reader_task.cancel()
     
     except WebSocketDisconnect:
         logger.info("Client disconnected from WebSocket")
@@ -880,26 +1185,34 @@ async def websocket_endpoint(websocket: WebSocket):
 
 @app.get("/rtc-config")
 async def rtc_config():
-    """Provide WebRTC ICE configuration to browser clients."""
+    """Provide WebRTC ICE configuration to browser clients.
+    
+    The ICE server list is cached for ICE_CACHE_TTL seconds so page reloads
+    don't repeat TURN credential fetches.
+    """
     try:
-        servers = build_client_ice_servers()
-        return {"iceServers": servers}
+        cache = await get_ice_servers()
+        return ORJSONResponse(cache["client"])
     except Exception as e:
         logger.error(f"rtc-config error: {e}")
-        return {"iceServers": [{"urls": "stun:stun.l.google.com:19302"}]}
+        return ORJSONResponse({"iceServers": [{"urls": "stun:stun.l.google.com:19302"}]})
+
+
+# Health payload is static for the process lifetime, so serialize it once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "mode": "asr_agent_text_only",
+    "services": {
+        "langgraph": SETTINGS.langgraph_url,
+        "riva_stt": SETTINGS.riva_url,
+    }
+})
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "mode": "asr_agent_text_only",
-        "services": {
-            "langgraph": os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024"),
-            "riva_stt": os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443"),
-        }
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # Mount Pipecat's standard prebuilt UI at /client
@@ -908,11 +1221,24 @@ logger.info("📺 Pipecat standard UI mounted at /client")
 
 # Mount custom UI at /app (optional)
 UI_DIST_DIR = Path(__file__).parent / "ui" / "dist"
-if UI_DIST_DIR.exists():
-    app.mount("/app", StaticFiles(directory=str(UI_DIST_DIR), html=True), name="custom-ui")
-    logger.info(f"📁 Custom UI serving from: {UI_DIST_DIR} at /app")
+_UI_DIST_STR = str(UI_DIST_DIR)
+
+# Immutable images can set HAS_CUSTOM_UI=1/0 at build time to skip the stat
+_has_custom_ui_env = os.getenv("HAS_CUSTOM_UI")
+HAS_CUSTOM_UI = (
+    _has_custom_ui_env == "1"
+    if _has_custom_ui_env is not None
+    else os.path.isdir(_UI_DIST_STR)
+)
+
+if HAS_CUSTOM_UI:
+    precompressed = precompress_static_files(UI_DIST_DIR)
+    if precompressed:
+        logger.info(f"🗜️  Precompressed {precompressed} UI assets")
+    app.mount("/app", CachedStaticFiles(directory=_UI_DIST_STR, html=True), name="custom-ui")
+    logger.info(f"📁 Custom UI serving from: {_UI_DIST_STR} at /app")
 else:
-    logger.warning(f"Custom UI directory not found: {UI_DIST_DIR}")
+    logger.warning(f"Custom UI directory not found: {_UI_DIST_STR}")
 
 
 if __name__ == "__main__":
@@ -932,27 +1258,56 @@ if __name__ == "__main__":
         logger.add(sys.stderr, level="INFO")
     
     # Check required environment variables
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY")
+    nvidia_api_key = SETTINGS.nvidia_key
     if not nvidia_api_key:
         logger.error("❌ Missing NVIDIA_API_KEY or NVIDIA_ASR_API_KEY")
         logger.error("   Set: NVIDIA_API_KEY=nvapi-your-key-here")
         sys.exit(1)
     
-    logger.info("=" * 70)
-    logger.info("🎤 ASR + Agent Pipeline (Text-Only Output)")
-    logger.info("=" * 70)
-    logger.info(f"🗣️  Voice Input: ✅ (Riva STT)")
-    logger.info(f"🤖 Agent: ✅ (LangGraph)")
-    logger.info(f"📝 Text Output: ✅ (No TTS)")
-    logger.info(f"🔊 Voice Output: ❌ (Text-only mode)")
-    logger.info("")
-    logger.info(f"LangGraph: {os.getenv('LANGGRAPH_BASE_URL', 'http://127.0.0.1:2024')}")
-    logger.info(f"Assistant: {os.getenv('LANGGRAPH_ASSISTANT', 'simple_agent')}")
-    logger.info(f"NVIDIA Key: {nvidia_api_key[:4]}...{nvidia_api_key[-4:]}")
-    logger.info(f"Sample Rate: {os.getenv('AUDIO_SAMPLE_RATE', '16000')}Hz")
-    logger.info("=" * 70)
-    logger.info(f"🌐 Server starting on http://{args.host}:{args.port}")
-    logger.info("=" * 70)
-    
-    uvicorn.run(app, host=args.host, port=args.port)
+    banner = "=" * 70
+    logger.info(
+        "{banner}\n"
+        "🎤 ASR + Agent Pipeline (Text-Only Output)\n"
+        "{banner}\n"
+        "🗣️  Voice Input: ✅ (Riva STT)\n"
+        "🤖 Agent: ✅ (LangGraph)\n"
+        "📝 Text Output: ✅ (No TTS)\n"
+        "🔊 Voice Output: ❌ (Text-only mode)\n"
+        "\n"
+        "LangGraph: {langgraph}\n"
+        "Assistant: {assistant}\n"
+        "NVIDIA Key: {key}\n"
+        "Sample Rate: {sample_rate}Hz\n"
+        "{banner}\n"
+        "🌐 Server starting on http://{host}:{port}\n"
+        "{banner}",
+        banner=banner,
+        langgraph=SETTINGS.langgraph_url,
+        assistant=SETTINGS.langgraph_assistant,
+        key=f"{nvidia_api_key[:4]}...{nvidia_api_key[-4:]}",
+        sample_rate=SETTINGS.sample_rate,
+        host=args.host,
+        port=args.port,
+    )
+    
+    # Prefer uvloop (libuv-backed) for WebRTC signaling / WebSocket I/O.
+    # Falls back to the stock asyncio loop where uvloop is unavailable (Windows).
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    logger.info(f"Event loop: {loop_impl}")
+    
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        loop=loop_impl,
+        http="httptools",
+        ws="websockets-sansio",  # Non-deprecated websockets implementation
+        ws_per_message_deflate=True,
+        timeout_graceful_shutdown=10,  # Bound the wait for open sessions to drain
+    )
 
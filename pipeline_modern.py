@@ -11,21 +11,26 @@ This pipeline uses:
 - FastAPI for the web server
 """
 
-import argparse
 import asyncio
-import json
+import itertools
 import os
 import sys
-import uuid
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Callable, NamedTuple, Optional
+from weakref import WeakValueDictionary
 
-import uvicorn
+import httpx
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from loguru import logger
 from pipecat_ai_small_webrtc_prebuilt.frontend import SmallWebRTCPrebuiltUI
 
@@ -35,6 +40,7 @@ from pipecat.frames.frames import (
     InterimTranscriptionFrame,
     TextFrame,
     EndFrame,
+    CancelFrame,
     TTSAudioRawFrame,
 )
 import numpy as np
@@ -56,12 +62,19 @@ from pipecat.transports.smallwebrtc.connection import (
     SmallWebRTCConnection,
 )
 from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
 from pipecat.frames.frames import InterimTranscriptionFrame, TranscriptionFrame
 from pipecat.utils.time import time_now_iso8601
 
+from _riva_channels import shared_riva_auth, use_shared_riva_channel
+from _static_files import CachedStaticFiles, precompress_static_files
+from _startup import configure_logging, log_banner, parse_args, serve
 from langgraph_llm_service import LangGraphLLMService
 
+# Scripts only: importing this module leaves os.environ untouched
+if __name__ == "__main__":
+    load_dotenv(override=True)
+
 
 class GainProcessor(FrameProcessor):
     """Apply configurable gain to TTS audio output.
@@ -89,7 +102,7 @@ class GainProcessor(FrameProcessor):
         self._enabled = gain != 1.0
         
         if self._enabled:
-            logger.info(f"🔊 GainProcessor initialized with gain={self._gain:.2f}x")
+            logger.info("🔊 GainProcessor initialized with gain={:.2f}x", self._gain)
         else:
             logger.debug("GainProcessor initialized but disabled (gain=1.0)")
     
@@ -103,7 +116,7 @@ class GainProcessor(FrameProcessor):
         """Set the gain value (clamped to max_gain)."""
         self._gain = min(value, self._max_gain)
         self._enabled = self._gain != 1.0
-        logger.info(f"🔊 GainProcessor gain set to {self._gain:.2f}x")
+        logger.info("🔊 GainProcessor gain set to {:.2f}x", self._gain)
     
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process frames, applying gain to TTS audio frames.
@@ -152,29 +165,625 @@ class GainProcessor(FrameProcessor):
         return audio_np.astype(np.int16).tobytes()
 
 
+class EnergyGatedSileroVADAnalyzer(SileroVADAnalyzer):
+    """Silero VAD behind a cheap spectral energy gate.
+    
+    Each VAD window is split into 8 log-spaced frequency bands and compared
+    with an adaptive per-band noise floor. Windows where no band rises more
+    than threshold_db above the floor are reported as silence without
+    running the neural net; everything else goes to Silero as before.
+    
+    Example:
+        vad = EnergyGatedSileroVADAnalyzer(params=vad_params, threshold_db=9.0)
+    """
+    
+    NUM_BANDS = 8
+    NOISE_FLOOR_ALPHA = 0.01  # Noise-floor EMA rate while gated (silence)
+    NOISE_FLOOR_FALL = 0.05   # Faster EMA rate for bands that drop below the floor
+    
+    def __init__(self, *, threshold_db: float = 9.0, reset_after_secs: float = 1.0, **kwargs):
+        """Initialize the gated analyzer.
+        
+        Args:
+            threshold_db: How far above the noise floor a band must be to reach Silero
+            reset_after_secs: Gated time after which Silero's state is reset
+                before the next window (it didn't see the gap)
+            **kwargs: Additional arguments passed to SileroVADAnalyzer
+        """
+        super().__init__(**kwargs)
+        self._threshold_db = threshold_db
+        self._reset_after_secs = reset_after_secs
+        self._band_key: Optional[tuple[int, int]] = None  # (window samples, sample rate)
+        self._band_starts: Optional[np.ndarray] = None
+        self._noise_floor_db: Optional[np.ndarray] = None
+        self._gated_secs = 0.0
+    
+    def _band_energies_db(self, samples: np.ndarray) -> np.ndarray:
+        """Return per-band log energies (dB) of one window."""
+        key = (len(samples), self.sample_rate)
+        if key != self._band_key:
+            # rfft bin where each band starts: 100 Hz .. Nyquist, log-spaced
+            hz_per_bin = self.sample_rate / len(samples)
+            edges = np.geomspace(100.0, self.sample_rate / 2, self.NUM_BANDS + 1)[:-1]
+            self._band_starts = np.unique((edges / hz_per_bin).astype(np.intp))
+            self._band_key = key
+            self._noise_floor_db = None
+        
+        power = np.abs(np.fft.rfft(samples)) ** 2
+        return 10.0 * np.log10(np.add.reduceat(power, self._band_starts) + 1e-10)
+    
+    def voice_confidence(self, buffer) -> float:
+        """Return 0.0 for windows below the energy gate, else Silero's confidence."""
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        bands_db = self._band_energies_db(samples)
+        
+        floor = self._noise_floor_db
+        if floor is None:
+            self._noise_floor_db = bands_db
+            return super().voice_confidence(buffer)
+        
+        # Follow quieter backgrounds down quickly (narrow bands are noisy,
+        # so don't snap straight to the minimum)
+        below = bands_db < floor
+        floor[below] += self.NOISE_FLOOR_FALL * (bands_db[below] - floor[below])
+        
+        if np.any(bands_db > floor + self._threshold_db):
+            if self._gated_secs >= self._reset_after_secs:
+                # Don't let the LSTM carry context across a gap it never saw
+                self._model.reset_states()
+            self._gated_secs = 0.0
+            return super().voice_confidence(buffer)
+        
+        # Silence: track slow background changes and skip the model
+        floor += self.NOISE_FLOOR_ALPHA * (bands_db - floor)
+        self._gated_secs += len(samples) / self.sample_rate
+        return 0.0
+
+
+# Optional: TEN VAD (smaller than Silero and quicker to detect speech→silence)
+try:
+    from ten_vad import TenVad
+    TEN_VAD_AVAILABLE = True
+except ImportError:
+    TEN_VAD_AVAILABLE = False
+
+
+class TenVadAnalyzer(VADAnalyzer):
+    """Pipecat VAD analyzer backed by TEN VAD.
+    
+    Works on 16ms (256-sample) windows at 16 kHz, half of Silero's window,
+    so the end of speech is noticed sooner.
+    """
+    
+    HOP_SIZE = 256  # 16ms at 16kHz
+    
+    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        """Initialize the analyzer.
+        
+        Args:
+            sample_rate: Audio sample rate (must be 16000; set later by the transport if None)
+            params: VAD parameters
+        """
+        super().__init__(sample_rate=sample_rate, params=params)
+        self._vad = TenVad(self.HOP_SIZE)
+    
+    def set_sample_rate(self, sample_rate: int):
+        """Set the sample rate (TEN VAD only supports 16 kHz)."""
+        if sample_rate != 16000:
+            raise ValueError(f"TEN VAD sample rate needs to be 16000 (sample rate: {sample_rate})")
+        super().set_sample_rate(sample_rate)
+    
+    def num_frames_required(self) -> int:
+        """Return the number of samples per analysis window."""
+        return self.HOP_SIZE
+    
+    def voice_confidence(self, buffer) -> float:
+        """Return TEN VAD's speech probability for one window."""
+        try:
+            probability, _ = self._vad.process(np.frombuffer(buffer, dtype=np.int16))
+            return float(probability)
+        except Exception as e:
+            logger.error("Error analyzing audio with TEN VAD: {}", e)
+            return 0.0
+
+
+# Silence needed to end a user turn, per VAD backend. Silero lags on the
+# speech→silence transition, so it needs a longer, more patient tail.
+VAD_STOP_SECS = {
+    "silero": 1.8,
+    "ten": 0.6,
+}
+
+# Adaptive end-of-turn tails per backend: (after a sentence-final interim,
+# after a mid-clause interim). VAD_STOP_SECS is used until the first interim.
+ADAPTIVE_STOP_SECS = {
+    "silero": (0.8, 1.8),
+    "ten": (0.3, 1.2),
+}
+
+
+def _resolve_vad_backend(requested: str) -> str:
+    """Map VAD_BACKEND to a backend that can actually run here.
+    
+    Args:
+        requested: Requested backend name ("ten" or "silero")
+        
+    Returns:
+        "ten" or "silero"
+    """
+    if requested == "ten" and not TEN_VAD_AVAILABLE:
+        logger.warning("⚠️  VAD_BACKEND=ten but ten-vad is not installed, using Silero")
+        return "silero"
+    if requested not in VAD_STOP_SECS:
+        logger.warning("⚠️  Unknown VAD_BACKEND '{}', using Silero", requested)
+        return "silero"
+    return requested
+
+
+class AdaptiveEndpointing(FrameProcessor):
+    """Adjust the VAD end-of-turn silence from the latest ASR interim.
+    
+    A pause after a sentence-final interim ("...?", "...。") ends the turn
+    quickly; a pause mid-clause gets the longer tail. Sits right after the
+    STT service and passes every frame through.
+    
+    Example:
+        endpointing = AdaptiveEndpointing(vad_analyzer, complete_secs=0.3, incomplete_secs=1.2)
+    """
+    
+    SENTENCE_FINAL = (".", "?", "!", "…", "。", "？", "！")
+    
+    def __init__(self, vad: VADAnalyzer, complete_secs: float, incomplete_secs: float, **kwargs):
+        """Initialize the controller.
+        
+        Args:
+            vad: The transport's VAD analyzer
+            complete_secs: Silence that ends a turn after a complete sentence
+            incomplete_secs: Silence that ends a turn mid-clause
+            **kwargs: Additional arguments passed to FrameProcessor
+        """
+        super().__init__(**kwargs)
+        self._vad = vad
+        self._complete_secs = complete_secs
+        self._incomplete_secs = incomplete_secs
+        self._default_secs = vad.params.stop_secs
+        self._stop_secs = self._default_secs
+    
+    def _set_stop_secs(self, stop_secs: float):
+        """Change the VAD stop threshold without touching its speaking state."""
+        if stop_secs == self._stop_secs or not self._vad.sample_rate:
+            return
+        # VADAnalyzer.set_params() also resets the speaking state, which would
+        # re-trigger user-started-speaking mid-utterance; only move the stop count
+        self._vad.params.stop_secs = stop_secs
+        self._vad._vad_stop_frames = round(stop_secs * self._vad.sample_rate / self._vad.num_frames_required())
+        self._stop_secs = stop_secs
+    
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        """Retune the VAD tail on ASR results and pass the frame on.
+        
+        Args:
+            frame: The frame to process
+            direction: The direction of frame flow
+        """
+        await super().process_frame(frame, direction)
+        
+        if isinstance(frame, InterimTranscriptionFrame):
+            text = frame.text.rstrip()
+            if text:
+                complete = text.endswith(self.SENTENCE_FINAL)
+                self._set_stop_secs(self._complete_secs if complete else self._incomplete_secs)
+        elif isinstance(frame, TranscriptionFrame):
+            # Turn is over; start the next one from the default
+            self._set_stop_secs(self._default_secs)
+        
+        await self.push_frame(frame, direction)
+
+
+# Optional: fastText language identification (native; preferred over langdetect)
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except ImportError:
+    FASTTEXT_AVAILABLE = False
+
+# langdetect profiles to load: every language in LANGDETECT_TO_FULL_CODE.
+# Scoring against 10 profiles instead of all 55 is much faster and smaller;
+# Riva languages outside this set skip text validation (see
+# _TEXT_LID_BASES) rather than being forced into the nearest profile.
+LANGDETECT_PROFILES = ("en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh-cn", "zh-tw")
+
+
+def _load_langdetect_profiles(languages: tuple[str, ...]):
+    """Install a langdetect factory that only knows the given languages.
+    
+    detect_langs() builds its global factory from every bundled profile on
+    first use; setting it here first makes it skip that.
+    
+    Args:
+        languages: langdetect profile names (e.g. "en", "zh-cn")
+    """
+    from langdetect import detector_factory
+    
+    json_profiles = []
+    for lang in languages:
+        profile_path = os.path.join(detector_factory.PROFILES_DIRECTORY, lang)
+        with open(profile_path, encoding="utf-8") as f:
+            json_profiles.append(f.read())
+    
+    factory = detector_factory.DetectorFactory()
+    factory.load_json_profile(json_profiles)
+    detector_factory.DetectorFactory.seed = 0  # Deterministic results (matches the LRU cache)
+    detector_factory._factory = factory
+
+
 # Optional: Text-based language detection for validation
 try:
-    from langdetect import detect_langs, LangDetectException
+    from langdetect import detect_langs
     LANGDETECT_AVAILABLE = True
     
+    try:
+        _load_langdetect_profiles(LANGDETECT_PROFILES)
+        logger.debug("langdetect profiles restricted to: {}", ', '.join(LANGDETECT_PROFILES))
+    except Exception as e:
+        logger.warning("⚠️  Could not restrict langdetect profiles, using all: {}", e)
+    
     # Quick sanity check that langdetect works
     try:
         test_result = detect_langs("Hello, how are you today?")
         if test_result and test_result[0].lang == 'en':
             logger.debug("langdetect sanity check passed ✅")
         else:
-            logger.warning(f"⚠️  langdetect sanity check unexpected result: {test_result}")
+            logger.warning("⚠️  langdetect sanity check unexpected result: {}", test_result)
     except Exception as e:
-        logger.warning(f"⚠️  langdetect sanity check failed: {e}")
+        logger.warning("⚠️  langdetect sanity check failed: {}", e)
         
 except ImportError:
     LANGDETECT_AVAILABLE = False
-    logger.warning("langdetect not installed - text-based language validation disabled")
-    logger.warning("Install with: pip install langdetect")
+    if not FASTTEXT_AVAILABLE:
+        logger.warning("langdetect not installed - text-based language validation disabled")
+        logger.warning("Install with: pip install langdetect")
+
+TEXT_LID_AVAILABLE = FASTTEXT_AVAILABLE or LANGDETECT_AVAILABLE
+
+_fasttext_model = None  # Loaded on first use; False once loading has failed
+
+
+def _get_fasttext_model():
+    """Load the fastText LID model (FASTTEXT_LID_MODEL, default lid.176.ftz) once.
+    
+    Returns:
+        The loaded model, or None if fastText is unavailable or the model
+        can't be loaded (langdetect is used instead)
+    """
+    global _fasttext_model
+    if _fasttext_model is None:
+        model_path = os.getenv("FASTTEXT_LID_MODEL", "lid.176.ftz")
+        try:
+            _fasttext_model = fasttext.load_model(model_path)
+            logger.info("fastText language ID model loaded: {}", model_path)
+        except Exception as e:
+            logger.warning("⚠️  Could not load fastText model {}: {}", model_path, e)
+            _fasttext_model = False
+    return _fasttext_model or None
+
+
+class TextLanguage(NamedTuple):
+    """One text language candidate (same fields as langdetect's Language)."""
+    lang: str
+    prob: float
+
+
+@lru_cache(maxsize=512)
+def _cached_detect(text: str) -> tuple[TextLanguage, ...]:
+    """Detect the language of a text once per distinct text.
+    
+    Uses fastText when its model is available, otherwise langdetect.
+    Interim and final Riva results repeat the same transcript many times,
+    and detect_langs is pure-Python n-gram scoring.
+    
+    Args:
+        text: Stripped transcript
+        
+    Returns:
+        Candidates ordered by probability (highest first)
+    """
+    model = _get_fasttext_model() if FASTTEXT_AVAILABLE else None
+    if model is not None:
+        # fastText rejects newlines; labels look like "__label__en"
+        labels, probs = model.predict(text.replace("\n", " "), k=3)
+        return tuple(
+            TextLanguage(label.removeprefix("__label__"), float(prob))
+            for label, prob in zip(labels, probs)
+        )
+    return tuple(TextLanguage(d.lang, d.prob) for d in detect_langs(text))
+
+
+# Default TTS voice per language in language-specific mode
+# IMPORTANT: This must match MAGPIE_LANGUAGE_CONFIG exactly!
+# Maps ALL language code variants to appropriate Magpie voices
+# Note: Magpie Multilingual only supports 5 languages: en-US, es-US, fr-FR, de-DE, zh-CN
+DEFAULT_VOICE_MAP = MappingProxyType({
+    # English (female - Mia)
+    "en-US": "Magpie-Multilingual.EN-US.Mia.Neutral",
+    "en-GB": "Magpie-Multilingual.EN-US.Mia.Neutral",  # UK → US voice
+    
+    # Spanish (female - Isabela)
+    "es-US": "Magpie-Multilingual.ES-US.Isabela",
+    "es-ES": "Magpie-Multilingual.ES-US.Isabela",      # Spain → US voice (same as adaptive)
+    
+    # French (male - Pascal) 👨 - Only male voice!
+    "fr-FR": "Magpie-Multilingual.FR-FR.Pascal",
+    
+    # German (female - Aria) - Match LanguageAdaptiveTTSService
+    "de-DE": "Magpie-Multilingual.DE-DE.Aria",
+    
+    # Chinese (female - Mia)
+    "zh-CN": "Magpie-Multilingual.ZH-CN.Mia",
+    "zh-TW": "Magpie-Multilingual.ZH-CN.Mia",     # Traditional → Simplified voice
+    
+    # Unsupported languages - fallback to English (Mia)
+    # These languages will use English voice to speak the foreign text
+    "pt-BR": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Portuguese → English voice
+    "it-IT": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Italian → English voice
+    "ja-JP": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Japanese → English voice
+    "ko-KR": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Korean → English voice
+})
+
+_lookup_voice = DEFAULT_VOICE_MAP.get
+
+# Custom /assistants display names, by assistant_id or graph_id
+DISPLAY_NAME_OVERRIDES = MappingProxyType({
+    "ace-base-agent": "ACE Base Agent",
+    "rbc-fees-agent": "Banking: Fee Agent",
+    "wire-transfer-agent": "Banking: Wire Transfer Agent",
+    "telco-agent": "Telco: Mobile Billing Agent",
+    "healthcare-agent": "Healthcare: Patient Intake",
+})
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Read a "true"/"false" environment variable."""
+    return os.getenv(name, default).lower() == "true"
+
+
+def _env_existing_path(name: str) -> Optional[Path]:
+    """Read a file path environment variable, or None if unset or missing.
+    
+    Resolved once at import so connections don't stat the file again.
+    """
+    value = os.getenv(name)
+    if not value:
+        return None
+    path = Path(value)
+    return path if path.exists() else None
+
+
+def _mask_key(key: Optional[str]) -> str:
+    """Loggable form of an API key: first and last 4 characters."""
+    return f"{key[:4]}...{key[-4:]}" if key else "<unset>"
 
-load_dotenv(override=True)
 
-app = FastAPI()
+# Riva custom_configuration entry that turns on multi-language detection
+LANGUAGE_DETECTION_PAIR = ("enable_automatic_language_detection", "true")
+
+
+def _parse_custom_config(config: str) -> tuple[tuple[str, str], ...]:
+    """Parse a Riva custom_configuration string ("k:v,k:v") into key/value pairs.
+    
+    Args:
+        config: Comma-separated key:value entries (empty entries are skipped)
+        
+    Returns:
+        Tuple of (key, value) pairs in their original order
+    """
+    pairs = []
+    for entry in config.split(","):
+        key, _, value = entry.strip().partition(":")
+        if key:
+            pairs.append((key, value))
+    return tuple(pairs)
+
+
+def _render_custom_config(pairs: tuple[tuple[str, str], ...]) -> str:
+    """Render key/value pairs back into Riva's custom_configuration string."""
+    return ",".join(f"{key}:{value}" for key, value in pairs)
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineConfig:
+    """Process-wide pipeline configuration, read from the environment once at import.
+    
+    run_bot reads these attributes instead of calling os.getenv per
+    connection. Client overrides (assistant, language) are applied on top.
+    """
+    sample_rate: int
+    audio_out_10ms_chunks: int
+    pipeline_pool: int
+    vad_backend: str
+    vad_device: str
+    adaptive_vad: bool
+    vad_energy_gate: bool
+    vad_energy_gate_db: float
+    use_simple_llm: bool
+    openai_api_key: Optional[str]
+    openai_model: str
+    system_prompt: str
+    langgraph_assistant: str
+    langgraph_base_url: str
+    langgraph_stream_mode: str
+    langgraph_debug_stream: bool
+    langgraph_auth_token: Optional[str]
+    exclude_assistants: frozenset[str]
+    user_email: str
+    asr_url: str
+    asr_language: str
+    asr_function_id: str
+    asr_model: str
+    asr_api_key: Optional[str]
+    asr_mandarin_function_id: Optional[str]
+    asr_mandarin_api_key: Optional[str]
+    asr_api_key_masked: str
+    asr_mandarin_api_key_masked: str
+    asr_custom_config_pairs: tuple[tuple[str, str], ...]
+    asr_custom_config: str
+    asr_custom_config_multi: str  # asr_custom_config + automatic language detection
+    asr_auto_punctuation: bool
+    asr_profanity_filter: bool
+    validate_language_with_text: bool
+    log_detected_language: bool
+    langdetect_always: bool
+    tts_api_key: Optional[str]
+    tts_api_key_masked: str
+    tts_url: str
+    tts_function_id: str
+    tts_model: str
+    tts_voice_id: Optional[str]
+    tts_quality: int
+    tts_output_gain: float
+    share_riva_channels: bool
+    ipa_dict_file: Optional[Path]
+    zero_shot_audio_prompt: Optional[Path]
+    transcription_logging: bool
+    
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        """Build the configuration from environment variables."""
+        # Support separate ASR/TTS keys or fall back to general NVIDIA key
+        asr_api_key = os.getenv("NVIDIA_ASR_API_KEY") or os.getenv("NVIDIA_API_KEY")
+        asr_mandarin_api_key = os.getenv("NVIDIA_RIVA_MANDARIN_API_KEY")
+        tts_api_key = os.getenv("NVIDIA_TTS_API_KEY") or os.getenv("NVIDIA_API_KEY")
+        # NOTE: Riva VAD is RE-ENABLED because disabling it causes truncated final transcripts
+        # Riva needs its VAD to properly finalize utterances even when Pipecat VAD triggers
+        custom_config_pairs = _parse_custom_config(os.getenv(
+            "RIVA_ASR_CUSTOM_CONFIG",
+            "enable_vad_endpointing:true,neural_vad.onset:0.5,apply_partial_itn:true"
+        ))
+        # Multi-language variant: same entries plus detection (unless already set)
+        multi_pairs = tuple(
+            pair for pair in custom_config_pairs if pair[0] != LANGUAGE_DETECTION_PAIR[0]
+        ) + (LANGUAGE_DETECTION_PAIR,)
+        return cls(
+            sample_rate=int(os.getenv("AUDIO_SAMPLE_RATE", "16000")),
+            audio_out_10ms_chunks=max(1, int(os.getenv("AUDIO_OUT_10MS_CHUNKS", "2"))),
+            pipeline_pool=max(0, int(os.getenv("PIPELINE_POOL", "4"))),
+            vad_backend=_resolve_vad_backend(
+                os.getenv("VAD_BACKEND", "ten" if TEN_VAD_AVAILABLE else "silero").lower()
+            ),
+            vad_device=os.getenv("VAD_DEVICE", "cpu").lower(),
+            adaptive_vad=_env_flag("ADAPTIVE_VAD", "true"),
+            vad_energy_gate=_env_flag("VAD_ENERGY_GATE", "true"),
+            vad_energy_gate_db=float(os.getenv("VAD_ENERGY_GATE_DB", "9.0")),
+            use_simple_llm=_env_flag("USE_SIMPLE_LLM"),
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+            system_prompt=os.getenv(
+                "SYSTEM_PROMPT",
+                "You are a helpful AI voice assistant. Keep your responses concise and natural "
+                "for voice conversation. Be friendly and engaging."
+            ),
+            langgraph_assistant=os.getenv("LANGGRAPH_ASSISTANT", "simple_agent"),
+            langgraph_base_url=os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024"),
+            langgraph_stream_mode=os.getenv("LANGGRAPH_STREAM_MODE", "messages"),
+            langgraph_debug_stream=_env_flag("LANGGRAPH_DEBUG_STREAM"),
+            langgraph_auth_token=(
+                os.getenv("LANGGRAPH_AUTH_TOKEN")
+                or os.getenv("AUTH0_ACCESS_TOKEN")
+                or os.getenv("AUTH_BEARER_TOKEN")
+            ),
+            exclude_assistants=frozenset(
+                name for name in os.getenv("EXCLUDE_ASSISTANTS", "").split(",") if name
+            ),
+            user_email=os.getenv("USER_EMAIL", "test@example.com"),
+            asr_url=os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443"),
+            asr_language=os.getenv("RIVA_ASR_LANGUAGE", "en-US"),
+            asr_function_id=os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409"),
+            asr_model=os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble"),
+            asr_api_key=asr_api_key,
+            asr_mandarin_function_id=os.getenv("NVIDIA_ASR_MANDARIN_FUNCTION_ID"),
+            asr_mandarin_api_key=asr_mandarin_api_key,
+            # Masked once here for the setup logs
+            asr_api_key_masked=_mask_key(asr_api_key),
+            asr_mandarin_api_key_masked=_mask_key(asr_mandarin_api_key),
+            asr_custom_config_pairs=custom_config_pairs,
+            # Rendered once here; run_bot just picks one
+            asr_custom_config=_render_custom_config(custom_config_pairs),
+            asr_custom_config_multi=_render_custom_config(multi_pairs),
+            asr_auto_punctuation=_env_flag("RIVA_ASR_AUTO_PUNCTUATION", "true"),
+            asr_profanity_filter=_env_flag("RIVA_ASR_PROFANITY_FILTER"),
+            validate_language_with_text=_env_flag("VALIDATE_LANGUAGE_WITH_TEXT", "true"),
+            log_detected_language=_env_flag("LOG_DETECTED_LANGUAGE", "true"),
+            langdetect_always=os.getenv("LANGDETECT_ALWAYS", "0") == "1",
+            tts_api_key=tts_api_key,
+            tts_api_key_masked=_mask_key(tts_api_key),
+            tts_url=os.getenv("RIVA_TTS_URL", "grpc.nvcf.nvidia.com:443"),
+            tts_function_id=os.getenv("NVIDIA_TTS_FUNCTION_ID", "c811837c-3343-42d9-83ef-a0a9e8f2be8c"),
+            tts_model=os.getenv("RIVA_TTS_MODEL", "magpie-tts-multilingual"),
+            tts_voice_id=os.getenv("RIVA_TTS_VOICE_ID"),
+            tts_quality=int(os.getenv("RIVA_TTS_QUALITY", "20")),
+            tts_output_gain=float(os.getenv("TTS_OUTPUT_GAIN", "1.0")),
+            share_riva_channels=_env_flag("RIVA_SHARED_CHANNEL", "true"),
+            ipa_dict_file=_env_existing_path("IPA_DICT_FILE"),
+            zero_shot_audio_prompt=_env_existing_path("ZERO_SHOT_AUDIO_PROMPT"),
+            transcription_logging=_env_flag("TRANSCRIPTION_LOGGING"),
+        )
+
+
+CFG = PipelineConfig.from_env()
+
+# Optional: HTTP/2 for the shared LangGraph client (needs the h2 package)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+async def warm_up():
+    """Prepare per-process resources so the first offer doesn't pay for them.
+    
+    Starts pre-building VAD analyzers, and loads the IPA dictionary, the
+    fastText model and the ICE servers, the same caches run_bot reads.
+    """
+    if CFG.vad_device == "cuda" and CFG.vad_backend != "ten":
+        # Before the pool's parallel builds: lru_cache doesn't stop two
+        # threads that miss at once from each creating a CUDA session
+        try:
+            await asyncio.to_thread(_cuda_silero_session)
+        except Exception as e:
+            logger.warning("Failed to create the CUDA Silero session: {}", e)
+    _vad_pool.refill()
+    
+    if CFG.ipa_dict_file is not None:
+        try:
+            await asyncio.to_thread(_load_ipa, CFG.ipa_dict_file)
+        except Exception as e:
+            logger.warning("Failed to preload IPA dictionary: {}", e)
+    
+    if FASTTEXT_AVAILABLE:
+        await asyncio.to_thread(_get_fasttext_model)
+    
+    try:
+        await build_client_ice_servers()
+    except Exception as e:
+        logger.warning("Failed to prefetch ICE servers: {}", e)
+    
+    logger.info("🔥 Warm-up done ({} VAD analyzers building)", CFG.pipeline_pool)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # One keep-alive pool for every LangGraph REST call (/assistants)
+    app.state.http = httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=8)
+    await warm_up()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -186,7 +795,36 @@ app.add_middleware(
 
 # Store connections and contexts by pc_id
 pcs_map: dict[str, SmallWebRTCConnection] = {}
-contexts_map: dict[str, OpenAILLMContext] = {}
+# Weak: each context is owned by its connection (connection._llm_context) and
+# drops out of here with it, even if the closed handler never runs
+contexts_map: WeakValueDictionary[str, OpenAILLMContext] = WeakValueDictionary()
+
+
+async def _on_connection_closed(webrtc_connection: SmallWebRTCConnection):
+    """Drop a closed connection from pcs_map (shared by every connection)."""
+    logger.info("Connection closed for pc_id: {}", webrtc_connection.pc_id)
+    pcs_map.pop(webrtc_connection.pc_id, None)
+
+
+# Per-process stream ids for log correlation (no urandom syscall per session)
+_stream_counter = itertools.count()
+
+# Twilio TURN credentials are valid for hours; reuse them instead of a
+# Twilio round-trip per connection (refreshed every TWILIO_ICE_CACHE_TTL seconds)
+TWILIO_ICE_CACHE_TTL = float(os.getenv("TWILIO_ICE_CACHE_TTL", "3600"))
+_ice_cache: Optional[tuple[float, list[dict]]] = None  # (fetched_at, servers)
+_ice_cache_lock = asyncio.Lock()
+
+# Env-var/public ICE servers never change while the process runs: built once
+_static_client_ice: Optional[list[dict]] = None
+# IceServer list for the client list it was converted from (reused until
+# the Twilio credentials refresh and hand back a new list)
+_server_ice_cache: Optional[tuple[list[dict], list[IceServer]]] = None
+
+# The UI polls /assistants; serve repeats from memory for ASSISTANTS_CACHE_TTL
+# seconds, keyed by (LangGraph URL, hash of the Authorization header, enrich)
+ASSISTANTS_CACHE_TTL = 60.0
+_assistants_cache: dict[tuple[str, Optional[int], bool], tuple[float, list[dict]]] = {}
 
 
 # NOTE: TranscriptionLogger removed due to Pipecat StartFrame handling issues
@@ -206,6 +844,48 @@ contexts_map: dict[str, OpenAILLMContext] = {}
 #         ...
 
 
+# Map langdetect codes to full language codes
+LANGDETECT_TO_FULL_CODE = {
+    "en": "en-US",
+    "es": "es-US",
+    "fr": "fr-FR",
+    "de": "de-DE",
+    "zh": "zh-CN",     # fastText label
+    "zh-cn": "zh-CN",
+    "zh-tw": "zh-CN",  # Map Traditional Chinese to Simplified
+    "pt": "pt-BR",
+    "it": "it-IT",
+    "ja": "ja-JP",
+    "ko": "ko-KR",
+}
+
+# Bound once at import: hot paths call this instead of resolving the class attribute
+_lookup_lang = LANGDETECT_TO_FULL_CODE.get
+
+
+# Canonical (interned) objects for the language codes Riva produces. Each
+# response's code is swapped for one of these, so later equality checks
+# against stored codes hit the identity fast path and the per-response
+# protobuf strings aren't kept alive.
+_INTERNED_LANGUAGE_CODES = {
+    code: sys.intern(code)
+    for code in (
+        "en-US", "en-GB", "es-US", "es-ES", "fr-FR", "de-DE",
+        "it-IT", "pt-BR", "ja-JP", "ko-KR", "zh-CN",
+    )
+}
+
+
+@lru_cache(maxsize=64)
+def _base_lang(code: str) -> str:
+    """Return the lowercase base language of a code ("de-DE" -> "de", "zh-cn" -> "zh")."""
+    return code.partition('-')[0].lower()
+
+
+# Base languages text validation can tell apart
+_TEXT_LID_BASES = frozenset(_base_lang(lang) for lang in LANGDETECT_PROFILES)
+
+
 class MultilingualRivaSTTService(RivaSTTService):
     """Extended Riva STT Service with language detection logging.
     
@@ -218,33 +898,71 @@ class MultilingualRivaSTTService(RivaSTTService):
     """
     
     # Map langdetect codes to full language codes
-    LANGDETECT_TO_FULL_CODE = {
-        "en": "en-US",
-        "es": "es-US",
-        "fr": "fr-FR",
-        "de": "de-DE",
-        "zh-cn": "zh-CN",
-        "zh-tw": "zh-CN",  # Map Traditional Chinese to Simplified
-        "pt": "pt-BR",
-        "it": "it-IT",
-        "ja": "ja-JP",
-        "ko": "ko-KR",
-    }
-    
-    def __init__(self, *args, log_detected_language: bool = True, validate_with_text: bool = True, **kwargs):
+    LANGDETECT_TO_FULL_CODE = LANGDETECT_TO_FULL_CODE
+    
+    # Riva confidence at or above which a repeat of the session's current
+    # language is accepted without text validation
+    TRUSTED_RIVA_CONFIDENCE = 0.95
+    
+    def __init__(
+        self,
+        *args,
+        log_detected_language: bool = True,
+        validate_with_text: bool = True,
+        always_validate: bool = False,
+        **kwargs,
+    ):
         """Initialize with language detection logging option.
         
         Args:
             log_detected_language: Whether to log detected languages (default: True)
             validate_with_text: Whether to validate acoustic detection with text analysis (default: True)
+            always_validate: Run text validation even when Riva confidently repeats
+                the current language (default: False, for debugging)
             *args, **kwargs: Passed to RivaSTTService
         """
         super().__init__(*args, **kwargs)
         self._log_detected_language = log_detected_language
-        self._validate_with_text = validate_with_text and LANGDETECT_AVAILABLE
+        self._validate_with_text = validate_with_text and TEXT_LID_AVAILABLE
+        self._always_validate = always_validate
         self._last_detected_language = None
+        self._detected_language = None
+        # Called when the detected language changes (e.g. to drop TTS caches)
+        self._language_listeners: list[Callable[[], None]] = []
+        # Whether Riva's SpeechRecognitionAlternative has a language_code field
+        # (read from the protobuf descriptor on the first response)
+        self._has_lang_field: Optional[bool] = None
+        # Checked once: DEBUG lines below format transcripts/reprs per response,
+        # so skip building them entirely when DEBUG is filtered out
+        self._debug_enabled = logger._core.min_level <= logger.level("DEBUG").no
+        # Last text actually run through langdetect, and its result
+        self._last_analyzed_text = ""
+        self._last_analyzed_result: tuple[TextLanguage, ...] = ()
+    
+    async def _detect_text_languages(self, clean_text: str) -> tuple[TextLanguage, ...]:
+        """Detect the language of a transcript, reusing recent results.
+        
+        A growing interim transcript that extends the last analyzed text by
+        less than 20% reuses that result; anything else goes through the
+        per-text LRU cache in a worker thread, so detection (CPU-bound)
+        doesn't stall the event loop that moves audio.
+        
+        Args:
+            clean_text: Stripped transcript
+            
+        Returns:
+            Candidates ordered by probability (highest first)
+        """
+        last_text = self._last_analyzed_text
+        if last_text and clean_text.startswith(last_text) and len(clean_text) < 1.2 * len(last_text):
+            return self._last_analyzed_result
+        
+        result = await asyncio.to_thread(_cached_detect, clean_text)
+        self._last_analyzed_text = clean_text
+        self._last_analyzed_result = result
+        return result
     
-    def _validate_language_with_text(self, riva_language: str, transcript: str, riva_confidence: float = None) -> str:
+    async def _validate_language_with_text(self, riva_language: str, transcript: str, riva_confidence: float = None) -> str:
         """Validate Riva's acoustic language detection using text analysis.
         
         Args:
@@ -255,12 +973,26 @@ class MultilingualRivaSTTService(RivaSTTService):
         Returns:
             Validated/corrected language code
         """
-        if not self._validate_with_text or not LANGDETECT_AVAILABLE:
+        if not self._validate_with_text or not TEXT_LID_AVAILABLE:
+            return riva_language
+        
+        # Steady state: Riva is confident and agrees with the session's language
+        if (
+            not self._always_validate
+            and riva_language == self._detected_language
+            and riva_confidence
+            and riva_confidence >= self.TRUSTED_RIVA_CONFIDENCE
+        ):
+            return riva_language
+        
+        # Text detection can't recognise this language, only misname it
+        if _base_lang(riva_language) not in _TEXT_LID_BASES:
             return riva_language
         
         if not transcript or len(transcript.strip()) < 10:
             # Text too short for reliable detection
-            logger.debug(f"   Transcript too short for text validation: {len(transcript.strip())} chars")
+            if self._debug_enabled:
+                logger.debug("   Transcript too short for text validation: {} chars", len(transcript.strip()))
             return riva_language
         
         try:
@@ -268,77 +1000,167 @@ class MultilingualRivaSTTService(RivaSTTService):
             clean_text = transcript.strip()
             
             # Debug: Show exactly what we're analyzing
-            logger.debug(f"   Analyzing text (length: {len(clean_text)}): '{clean_text}'")
-            logger.debug(f"   Text repr: {repr(clean_text)}")
+            if self._debug_enabled:
+                logger.debug("   Analyzing text (length: {}): '{}'", len(clean_text), clean_text)
+                logger.debug("   Text repr: {}", repr(clean_text))
             
             # Detect language from text
-            text_detections = detect_langs(clean_text)
+            text_detections = await self._detect_text_languages(clean_text)
             if not text_detections:
                 return riva_language
             
             top_text = text_detections[0]
-            text_lang_code = self.LANGDETECT_TO_FULL_CODE.get(top_text.lang, riva_language)
+            text_lang_code = _lookup_lang(top_text.lang, riva_language)
             
             # Debug: Show top 3 text detections
-            logger.debug(f"   Text detection results:")
-            for i, det in enumerate(text_detections[:3], 1):
-                logger.debug(f"     {i}. {det.lang}: {det.prob:.3f}")
+            if self._debug_enabled:
+                logger.debug("   Text detection results:")
+                for i, det in enumerate(text_detections[:3], 1):
+                    logger.debug("     {}. {}: {:.3f}", i, det.lang, det.prob)
             
             # Compare base language codes (ignore region)
-            riva_base = riva_language.split('-')[0].lower()
-            text_base = top_text.lang.lower()
+            riva_base = _base_lang(riva_language)
+            text_base = _base_lang(top_text.lang)
             
             # Check for mismatch
             if riva_base != text_base:
-                logger.warning(f"⚠️  LANGUAGE MISMATCH DETECTED!")
-                logger.warning(f"   Riva acoustic: {riva_language} (confidence: {riva_confidence or 'N/A'})")
-                logger.warning(f"   Text analysis: {text_lang_code} (confidence: {top_text.prob:.2f})")
-                logger.warning(f"   Transcript: {transcript[:80]}...")
+                logger.warning("⚠️  LANGUAGE MISMATCH DETECTED!")
+                logger.warning("   Riva acoustic: {} (confidence: {})", riva_language, riva_confidence or 'N/A')
+                logger.warning("   Text analysis: {} (confidence: {:.2f})", text_lang_code, top_text.prob)
+                logger.warning("   Transcript: {}...", transcript[:80])
                 
                 # Override logic - be more aggressive in trusting text
                 # Text is often more reliable than acoustic for written languages
-                should_override = False
-                reason = ""
+                text_prob = top_text.prob
                 
                 # Calculate gap to second place
                 second_place_prob = text_detections[1].prob if len(text_detections) > 1 else 0
-                confidence_gap = top_text.prob - second_place_prob
+                confidence_gap = text_prob - second_place_prob
                 
-                # Debug the decision
-                logger.debug(f"   Decision logic:")
-                logger.debug(f"     text_prob={top_text.prob:.3f}, riva_conf={riva_confidence}, gap={confidence_gap:.3f}")
+                # Override rules, evaluated together (bitwise ops, no short-circuit branches):
+                # 1. Text is very confident
+                # 2. Text is reasonably confident AND Riva is suspiciously overconfident
+                #    (Riva at 0.99 for wrong language is a red flag)
+                # 3. Text has a clear winner (big gap to 2nd place)
+                text_very_confident = text_prob > 0.85
+                riva_overconfident = (text_prob > 0.65) & (riva_confidence is None or riva_confidence > 0.95)
+                clear_winner = (text_prob > 0.60) & (confidence_gap > 0.30)
+                should_override = text_very_confident | riva_overconfident | clear_winner
                 
-                if top_text.prob > 0.85:
-                    # Text is very confident - always override
-                    should_override = True
-                    reason = "text very confident (>0.85)"
-                    logger.debug(f"     → Condition 1 triggered: {top_text.prob:.3f} > 0.85")
-                elif top_text.prob > 0.65 and (riva_confidence is None or riva_confidence > 0.95):
-                    # Text is reasonably confident AND Riva is suspiciously overconfident
-                    # Riva at 0.99 for wrong language is a red flag
-                    should_override = True
-                    reason = "text confident AND Riva suspiciously overconfident"
-                    logger.debug(f"     → Condition 2 triggered: text>{top_text.prob:.3f}>0.65 AND riva={riva_confidence}>0.95")
-                elif top_text.prob > 0.60 and confidence_gap > 0.30:
-                    # Text has clear winner (big gap to 2nd place)
-                    should_override = True
-                    reason = f"text has clear winner (gap: {confidence_gap:.2f})"
-                    logger.debug(f"     → Condition 3 triggered: {top_text.prob:.3f}>0.60 AND gap={confidence_gap:.3f}>0.30")
-                else:
-                    logger.debug(f"     → No condition met")
+                # Debug the decision
+                if self._debug_enabled:
+                    logger.debug("   Decision logic:")
+                    logger.debug("     text_prob={:.3f}, riva_conf={}, gap={:.3f}", text_prob, riva_confidence, confidence_gap)
+                    logger.debug(
+                        "     → very_confident={}, riva_overconfident={}, clear_winner={}",
+                        text_very_confident, riva_overconfident, clear_winner,
+                    )
                 
                 if should_override:
-                    logger.warning(f"   🔄 OVERRIDING to {text_lang_code} ({reason})")
+                    # First matching rule, in priority order
+                    reason = next(
+                        reason for met, reason in (
+                            (text_very_confident, "text very confident (>0.85)"),
+                            (riva_overconfident, "text confident AND Riva suspiciously overconfident"),
+                            (clear_winner, f"text has clear winner (gap: {confidence_gap:.2f})"),
+                        ) if met
+                    )
+                    logger.warning("   🔄 OVERRIDING to {} ({})", text_lang_code, reason)
                     return text_lang_code
                 else:
-                    logger.warning(f"   → Keeping {riva_language} (insufficient confidence to override)")
+                    logger.warning("   → Keeping {} (insufficient confidence to override)", riva_language)
             
             return riva_language
             
-        except LangDetectException as e:
-            logger.debug(f"Text language detection failed: {e}")
+        except Exception as e:  # LangDetectException or a fastText error
+            logger.debug("Text language detection failed: {}", e)
             return riva_language
     
+    def _riva_language(self, alternative) -> Optional[str]:
+        """Extract Riva's acoustic language code from a recognition alternative.
+        
+        Args:
+            alternative: Riva SpeechRecognitionAlternative
+            
+        Returns:
+            Interned language code (e.g. "de-DE"), or None if Riva didn't report one
+        """
+        # language_code is a repeated field (list) in the protobuf
+        if self._has_lang_field is None:
+            self._has_lang_field = "language_code" in type(alternative).DESCRIPTOR.fields_by_name
+        language_codes = alternative.language_code if self._has_lang_field else None
+        if not language_codes:
+            return None
+        
+        # Handle protobuf repeated field (acts like a list)
+        try:
+            language = language_codes if isinstance(language_codes, str) else language_codes[0]
+        except (TypeError, IndexError):
+            # Last resort: parse the string form
+            lang_str = str(language_codes)
+            # Clean up if it's a string representation of a list: "['en-US']" -> "en-US"
+            if lang_str.startswith("['") and lang_str.endswith("']"):
+                language = lang_str[2:-2]
+            elif lang_str.startswith("[") and lang_str.endswith("]"):
+                language = lang_str[1:-1].strip("'\"")
+            else:
+                language = lang_str
+        return _INTERNED_LANGUAGE_CODES.get(language, language)
+    
+    async def _resolve_language(self, alternative, transcript: str, is_final: bool) -> tuple[Optional[str], str, float]:
+        """Decide the language of one recognition result.
+        
+        Covers all three cases in one place: Riva only, text only (Riva
+        reported nothing), and Riva validated against text. Text detection
+        only runs for finals; interims get Riva's code as-is.
+        
+        Args:
+            alternative: Riva SpeechRecognitionAlternative
+            transcript: The alternative's transcript
+            is_final: Whether the result is final
+            
+        Returns:
+            (language or None, source: "riva" | "text" | "none", Riva confidence)
+        """
+        # Protobuf scalar: 0.0 when Riva doesn't report it
+        confidence = alternative.confidence
+        riva_language = self._riva_language(alternative)
+        source = "riva" if riva_language else "none"
+        
+        # ALWAYS validate finals with text-based detection if we have transcript
+        # This is important because:
+        # 1. Riva might not return language_code
+        # 2. Riva might return wrong language
+        # 3. Text detection can fill gaps
+        if not (is_final and transcript and self._validate_with_text):
+            return riva_language, source, confidence
+        
+        try:
+            # If Riva detected a language, validate it
+            if riva_language:
+                validated_language = await self._validate_language_with_text(
+                    riva_language,
+                    transcript,
+                    confidence
+                )
+                if validated_language != riva_language:
+                    logger.info("✅ Language corrected: {} → {}", riva_language, validated_language)
+                    return validated_language, "text", confidence
+            else:
+                # Riva didn't detect - use text detection as primary
+                logger.debug("   Riva returned no language, using text detection")
+                text_detections = await self._detect_text_languages(transcript.strip())
+                if text_detections and text_detections[0].prob > 0.70:
+                    text_lang = text_detections[0].lang
+                    text_conf = text_detections[0].prob
+                    language = _lookup_lang(text_lang, "en-US")
+                    logger.info("🌐 Language from text: {} (confidence: {:.2f})", language, text_conf)
+                    return language, "text", confidence
+        except Exception as e:
+            logger.debug("Text validation error: {}", e)
+        
+        return riva_language, source, confidence
+    
     async def _handle_response(self, response):
         """Override to extract and log detected language from Riva responses.
         
@@ -346,108 +1168,74 @@ class MultilingualRivaSTTService(RivaSTTService):
         SpeechRecognitionAlternative when using multi-language mode,
         then calls the parent handler.
         """
-        # Extract detected language if available
-        detected_language = None
         try:
             for result in response.results:
-                if result and result.alternatives:
-                    alternative = result.alternatives[0]
-                    
-                    # CRITICAL: Get transcript FIRST before validation
-                    transcript = alternative.transcript
-                    
-                    # Get the detected language code(s)
-                    # language_code is a repeated field (list) in the protobuf
-                    if hasattr(alternative, 'language_code') and alternative.language_code:
-                        # Handle protobuf repeated field (acts like a list)
-                        try:
-                            # Try to access as a list/sequence
-                            if len(alternative.language_code) > 0:
-                                detected_language = str(alternative.language_code[0])
-                            else:
-                                detected_language = None
-                                logger.debug("⚠️  Riva returned empty language_code list")
-                        except (TypeError, IndexError):
-                            # If not subscriptable, try direct string conversion
-                            lang_str = str(alternative.language_code)
-                            # Clean up if it's a string representation of a list: "['en-US']" -> "en-US"
-                            if lang_str.startswith("['") and lang_str.endswith("']"):
-                                detected_language = lang_str[2:-2]
-                            elif lang_str.startswith("[") and lang_str.endswith("]"):
-                                detected_language = lang_str[1:-1].strip("'\"")
-                            else:
-                                detected_language = lang_str
-                        
-                        # Get confidence score if available
-                        confidence = getattr(alternative, 'confidence', None)
-                    
-                    # ALWAYS validate with text-based detection if we have transcript
-                    # This is important because:
-                    # 1. Riva might not return language_code
-                    # 2. Riva might return wrong language
-                    # 3. Text detection can fill gaps
-                    if transcript and self._validate_with_text and LANGDETECT_AVAILABLE:
-                        try:
-                            # If Riva detected a language, validate it
-                            if detected_language:
-                                validated_language = self._validate_language_with_text(
-                                    detected_language, 
-                                    transcript, 
-                                    confidence
-                                )
-                                if validated_language != detected_language:
-                                    logger.info(f"✅ Language corrected: {detected_language} → {validated_language}")
-                                    detected_language = validated_language
-                            else:
-                                # Riva didn't detect - use text detection as primary
-                                logger.debug("   Riva returned no language, using text detection")
-                                text_detections = detect_langs(transcript.strip())
-                                if text_detections and text_detections[0].prob > 0.70:
-                                    text_lang = text_detections[0].lang
-                                    text_conf = text_detections[0].prob
-                                    detected_language = self.LANGDETECT_TO_FULL_CODE.get(text_lang, "en-US")
-                                    logger.info(f"🌐 Language from text: {detected_language} (confidence: {text_conf:.2f})")
-                        except Exception as e:
-                            logger.debug(f"Text validation error: {e}")
-                    
-                    # Store detected/validated language for this session
-                    if detected_language:
+                if not (result and result.alternatives):
+                    continue
+                # Interims are only logged; skip them outright when logging is off
+                if not result.is_final and not self._log_detected_language:
+                    continue
+                
+                alternative = result.alternatives[0]
+                transcript = alternative.transcript
+                detected_language, source, confidence = await self._resolve_language(
+                    alternative, transcript, result.is_final
+                )
+                
+                # Interim results: log and move on. Only finals reach the
+                # LLM/TTS, so language tracking runs on finals only.
+                if not result.is_final:
+                    if self._debug_enabled and transcript and result.stability == 1.0:
+                        current_lang = detected_language or self._detected_language
+                        lang_tag = f" [🌐 {current_lang}]" if current_lang else " [🌐 None]"
+                        logger.debug("🎤 USER (interim){}: {}", lang_tag, transcript)
+                        logger.debug("   📏 Length: {} chars, Stability: {}", len(transcript), result.stability)
+                    continue
+                
+                # Store detected/validated language for this session
+                if detected_language:
+                    if detected_language != self._detected_language:
                         self._detected_language = detected_language
-                        
-                        # Log language changes (with confidence if available)
-                        if self._log_detected_language and detected_language != self._last_detected_language:
-                            conf_str = f" (confidence: {confidence:.2f})" if confidence else ""
-                            logger.info(f"🌐 Language detected: {detected_language}{conf_str}")
-                            # Also log the actual text to help identify misdetections
-                            if transcript:
-                                logger.debug(f"   Transcript: {transcript[:50]}...")
-                            self._last_detected_language = detected_language
-                    else:
-                        # No language_code in response - log this
-                        logger.debug("⚠️  Riva response missing language_code field (not returned for this utterance)")
+                        for listener in self._language_listeners:
+                            listener()
                     
-                    # Log transcription with detected language
-                    # (transcript already extracted at top of loop)
-                    if transcript and len(transcript) > 0 and self._log_detected_language:
-                        # Use detected language, or fall back to last detected, or show None
-                        current_lang = detected_language or getattr(self, '_detected_language', None)
-                        lang_tag = f" [🌐 {current_lang}]" if current_lang else " [🌐 None]"
-                        
-                        if result.is_final:
-                            if not detected_language and hasattr(self, '_detected_language'):
-                                logger.debug(f"   (Using last detected language: {self._detected_language})")
-                            logger.info(f"🎤 USER (final){lang_tag}: {transcript}")
-                            logger.info(f"   📏 Transcript length: {len(transcript)} chars")
-                            logger.info(f"   🔊 Audio confidence: {confidence if confidence else 'N/A'}")
-                        elif result.stability == 1.0:
-                            logger.debug(f"🎤 USER (interim){lang_tag}: {transcript}")
-                            logger.debug(f"   📏 Length: {len(transcript)} chars, Stability: {result.stability}")
+                    # Log language changes (with confidence if available)
+                    if self._log_detected_language and detected_language != self._last_detected_language:
+                        conf_str = f" (confidence: {confidence:.2f})" if confidence else ""
+                        logger.info("🌐 Language detected: {}{} [from {}]", detected_language, conf_str, source)
+                        # Also log the actual text to help identify misdetections
+                        if transcript and self._debug_enabled:
+                            logger.debug("   Transcript: {}...", transcript[:50])
+                        self._last_detected_language = detected_language
+                else:
+                    # No language_code in response - log this
+                    logger.debug("⚠️  Riva response missing language_code field (not returned for this utterance)")
+                
+                # Log transcription with detected language
+                if transcript and self._log_detected_language:
+                    # Use detected language, or fall back to last detected, or show None
+                    current_lang = detected_language or self._detected_language
+                    lang_tag = f" [🌐 {current_lang}]" if current_lang else " [🌐 None]"
+                    
+                    if self._debug_enabled and not detected_language and self._detected_language:
+                        logger.debug("   (Using last detected language: {})", self._detected_language)
+                    logger.info("🎤 USER (final){}: {}", lang_tag, transcript)
+                    logger.info("   📏 Transcript length: {} chars", len(transcript))
+                    logger.info("   🔊 Audio confidence: {}", confidence if confidence else 'N/A')
         except Exception as e:
-            logger.debug(f"Error extracting language from Riva response: {e}")
+            logger.debug("Error extracting language from Riva response: {}", e)
         
         # Call parent handler to process the response normally
         await super()._handle_response(response)
     
+    def add_language_listener(self, listener: Callable[[], None]):
+        """Register a callback fired whenever the detected language changes.
+        
+        Args:
+            listener: Zero-argument callable
+        """
+        self._language_listeners.append(listener)
+    
     def get_detected_language(self) -> str:
         """Get the most recently detected language code.
         
@@ -458,12 +1246,59 @@ class MultilingualRivaSTTService(RivaSTTService):
         Returns:
             Language code (e.g., "en-US", "es-ES") or None if no language detected yet
         """
-        detected = getattr(self, '_detected_language', None)
+        detected = self._detected_language
         if not detected:
             logger.debug("⚠️  No language detected yet - using default")
         return detected
 
 
+# Voice and language mapping for Magpie TTS Multilingual
+# Riva API requires BOTH voice_id AND language_code to match
+# Format: language_code -> (voice_id, riva_language_code)
+# Magpie supports only 5 languages: en-US, es-US, fr-FR, de-DE, zh-CN
+MAGPIE_LANGUAGE_CONFIG = {
+    # English (en-US)
+    "en-US": {
+        "voice_id": "Magpie-Multilingual.EN-US.Mia.Neutral",
+        "language_code": "en-US"
+    },
+    "en-GB": {
+        "voice_id": "Magpie-Multilingual.EN-US.Mia.Neutral",
+        "language_code": "en-US"  # Fallback to en-US
+    },
+    
+    # Spanish (es-US)
+    "es-US": {
+        "voice_id": "Magpie-Multilingual.ES-US.Isabela",
+        "language_code": "es-US"
+    },
+    "es-ES": {
+        "voice_id": "Magpie-Multilingual.ES-US.Isabela",
+        "language_code": "es-US"  # Fallback to es-US
+    },
+    
+    # French (fr-FR)
+    "fr-FR": {
+        "voice_id": "Magpie-Multilingual.FR-FR.Pascal",
+        "language_code": "fr-FR"
+    },
+    
+    # German (de-DE)
+    "de-DE": {
+        "voice_id": "Magpie-Multilingual.DE-DE.Aria",
+        "language_code": "de-DE"
+    },
+    
+    # Mandarin Chinese (zh-CN)
+    "zh-CN": {
+        "voice_id": "Magpie-Multilingual.ZH-CN.Mia",
+        "language_code": "zh-CN"
+    },
+}
+
+_lookup_tts_config = MAGPIE_LANGUAGE_CONFIG.get
+
+
 class LanguageAdaptiveTTSService(RivaTTSService):
     """TTS Service that dynamically switches voices based on detected language.
     
@@ -472,48 +1307,7 @@ class LanguageAdaptiveTTSService(RivaTTSService):
     """
     
     # Voice and language mapping for Magpie TTS Multilingual
-    # Riva API requires BOTH voice_id AND language_code to match
-    # Format: language_code -> (voice_id, riva_language_code)
-    # Magpie supports only 5 languages: en-US, es-US, fr-FR, de-DE, zh-CN
-    LANGUAGE_CONFIG_MAP = {
-        # English (en-US)
-        "en-US": {
-            "voice_id": "Magpie-Multilingual.EN-US.Mia.Neutral",
-            "language_code": "en-US"
-        },
-        "en-GB": {
-            "voice_id": "Magpie-Multilingual.EN-US.Mia.Neutral",
-            "language_code": "en-US"  # Fallback to en-US
-        },
-        
-        # Spanish (es-US)
-        "es-US": {
-            "voice_id": "Magpie-Multilingual.ES-US.Isabela",
-            "language_code": "es-US"
-        },
-        "es-ES": {
-            "voice_id": "Magpie-Multilingual.ES-US.Isabela",
-            "language_code": "es-US"  # Fallback to es-US
-        },
-        
-        # French (fr-FR)
-        "fr-FR": {
-            "voice_id": "Magpie-Multilingual.FR-FR.Pascal",
-            "language_code": "fr-FR"
-        },
-        
-        # German (de-DE)
-        "de-DE": {
-            "voice_id": "Magpie-Multilingual.DE-DE.Aria",
-            "language_code": "de-DE"
-        },
-        
-        # Mandarin Chinese (zh-CN)
-        "zh-CN": {
-            "voice_id": "Magpie-Multilingual.ZH-CN.Mia",
-            "language_code": "zh-CN"
-        },
-    }
+    LANGUAGE_CONFIG_MAP = MAGPIE_LANGUAGE_CONFIG
     
     def __init__(self, *args, stt_service=None, default_language="en-US", **kwargs):
         """Initialize with reference to STT service for language detection.
@@ -526,7 +1320,16 @@ class LanguageAdaptiveTTSService(RivaTTSService):
         super().__init__(*args, **kwargs)
         self._stt_service = stt_service
         self._default_language = default_language
+        # Target language for this turn; only re-read from the STT service
+        # after it reports a language change
+        self._cached_target_lang: Optional[str] = None
+        if stt_service is not None and hasattr(stt_service, 'add_language_listener'):
+            stt_service.add_language_listener(self.invalidate_language)
         self._current_language = default_language
+        # Last requested language and its resolved Magpie config; a repeat
+        # request skips the lookup and the switch entirely
+        self._last_target_language: Optional[str] = None
+        self._current_lang_config: Optional[dict] = None
     
     def _get_config_for_language(self, language_code: str) -> dict:
         """Get voice and language configuration for a language code.
@@ -537,36 +1340,27 @@ class LanguageAdaptiveTTSService(RivaTTSService):
         Returns:
             Dict with voice_id and language_code, or None if not supported
         """
-        return self.LANGUAGE_CONFIG_MAP.get(language_code)
+        return _lookup_tts_config(language_code)
     
-    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
-        """Synthesize speech with language-appropriate voice.
+    def _switch_language(self, target_language: str):
+        """Point voice and language code at the Magpie config for a language.
         
-        Detects language from STT service and switches voice/language accordingly.
+        Args:
+            target_language: Requested language code; unsupported codes fall
+                back to the default language
         """
-        # Get detected language from STT service if available
-        detected_lang = None
-        if self._stt_service and hasattr(self._stt_service, 'get_detected_language'):
-            detected_lang = self._stt_service.get_detected_language()
-        
-        # Debug logging
-        logger.debug(f"TTS: Detected language from STT: {repr(detected_lang)}")
-        
-        # Use detected language or fallback to default
-        target_language = detected_lang or self._default_language
-        logger.debug(f"TTS: Target language: {repr(target_language)}")
-        
         # Check if target language is supported by Magpie
-        lang_config = self._get_config_for_language(target_language)
+        requested_language = target_language
+        lang_config = _lookup_tts_config(target_language)
         if not lang_config:
-            logger.warning(f"⚠️  Language {target_language} not supported by Magpie TTS. Falling back to {self._default_language}")
-            logger.warning(f"   Magpie supports: en-US, es-US, fr-FR, de-DE, zh-CN")
+            logger.warning("⚠️  Language {} not supported by Magpie TTS. Falling back to {}", target_language, self._default_language)
+            logger.warning("   Magpie supports: en-US, es-US, fr-FR, de-DE, zh-CN")
             target_language = self._default_language
-            lang_config = self._get_config_for_language(target_language)
+            lang_config = _lookup_tts_config(target_language)
         
         # Log language switch if changed
         if target_language != self._current_language:
-            logger.info(f"🔊 TTS switching to language: {target_language}")
+            logger.info("🔊 TTS switching to language: {}", target_language)
             self._current_language = target_language
             
             # Update BOTH voice ID and language code for Magpie Multilingual
@@ -576,14 +1370,45 @@ class LanguageAdaptiveTTSService(RivaTTSService):
             new_language_code = lang_config["language_code"]
             
             if new_voice_id != self._voice_id:
-                logger.info(f"   Switching voice to: {new_voice_id}")
+                logger.info("   Switching voice to: {}", new_voice_id)
                 self._voice_id = new_voice_id
             
             if new_language_code != self._language_code:
-                logger.info(f"   Switching language code to: {new_language_code}")
+                logger.info("   Switching language code to: {}", new_language_code)
                 self._language_code = new_language_code
             
-            logger.debug(f"   Final config - Voice: {self._voice_id}, Language: {self._language_code}")
+            logger.debug("   Final config - Voice: {}, Language: {}", self._voice_id, self._language_code)
+        
+        self._last_target_language = requested_language
+        self._current_lang_config = lang_config
+    
+    def invalidate_language(self):
+        """Forget the cached target language so the next run_tts asks STT again."""
+        self._cached_target_lang = None
+    
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        """Synthesize speech with language-appropriate voice.
+        
+        Detects language from STT service and switches voice/language accordingly.
+        """
+        target_language = self._cached_target_lang
+        if target_language is None:
+            # Get detected language from STT service if available
+            detected_lang = None
+            if self._stt_service and hasattr(self._stt_service, 'get_detected_language'):
+                detected_lang = self._stt_service.get_detected_language()
+            
+            # Debug logging
+            logger.debug("TTS: Detected language from STT: {}", repr(detected_lang))
+            
+            # Use detected language or fallback to default
+            target_language = detected_lang or self._default_language
+            self._cached_target_lang = target_language
+            logger.debug("TTS: Target language: {}", repr(target_language))
+        
+        # Steady state: same language as last call, voice already set
+        if target_language != self._last_target_language:
+            self._switch_language(target_language)
         
         # Use parent's run_tts with updated language and voice
         async for frame in super().run_tts(text):
@@ -591,56 +1416,199 @@ class LanguageAdaptiveTTSService(RivaTTSService):
 
 
 class WebsocketTranscriptOutput(FrameProcessor):
-    """Send transcriptions to WebSocket for UI display."""
+    """Send transcriptions to WebSocket for UI display.
+    
+    Messages are queued and flushed by a background task every
+    FLUSH_INTERVAL seconds, so process_frame never waits on the socket and
+    an interim transcript that is superseded within the same window is
+    dropped instead of sent.
+    
+    Each message is encoded as soon as it is queued, from one reusable
+    payload dict per message shape; queue entries are (role, final, text).
+    """
+    
+    FLUSH_INTERVAL = 0.05  # Seconds to collect messages before a flush
 
     def __init__(self, websocket: WebSocket):
         super().__init__()
         self._websocket = websocket
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        # Reused payloads: only "text" (and "stability") change per message
+        self._user_final_payload = {"type": "transcription", "role": "user", "text": "", "final": True}
+        self._user_interim_payload = {
+            "type": "transcription", "role": "user", "text": "", "final": False, "stability": None
+        }
+        self._assistant_payload = {"type": "transcription", "role": "assistant", "text": "", "final": True}
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        """Process frames and send transcriptions to WebSocket."""
+    @staticmethod
+    def _coalesce(batch: list[tuple[str, bool, str]]) -> list[tuple[str, bool, str]]:
+        """Drop interim messages followed by a newer message for the same role.
         
-        if isinstance(frame, TranscriptionFrame):
-            # User final transcription
-            try:
-                await self._websocket.send_json({
-                    "type": "transcription",
-                    "role": "user",
-                    "text": frame.text,
-                    "final": True
-                })
-            except Exception as e:
-                logger.debug(f"WebSocket send error: {e}")
-        
-        elif isinstance(frame, InterimTranscriptionFrame):
-            # User interim transcription
-            try:
-                await self._websocket.send_json({
-                    "type": "transcription",
-                    "role": "user",
-                    "text": frame.text,
-                    "final": False,
-                    "stability": frame.stability if hasattr(frame, 'stability') else None
-                })
-            except Exception as e:
-                logger.debug(f"WebSocket send error: {e}")
-        
-        elif isinstance(frame, TextFrame):
-            # Bot response text (from LLM)
-            try:
-                await self._websocket.send_json({
-                    "type": "transcription",
-                    "role": "assistant",
-                    "text": frame.text,
-                    "final": True
-                })
-            except Exception as e:
-                logger.debug(f"WebSocket send error: {e}")
+        Args:
+            batch: Messages in arrival order
+            
+        Returns:
+            Messages to send, in arrival order
+        """
+        kept = []
+        for i, msg in enumerate(batch):
+            if (
+                not msg[1]
+                and i + 1 < len(batch)
+                and batch[i + 1][0] == msg[0]
+            ):
+                continue
+            kept.append(msg)
+        return kept
+
+    async def _flush_loop(self):
+        """Send queued messages in coalesced batches until a None entry is queued."""
+        while True:
+            batch = [await self._queue.get()]
+            if batch[0] is not None:
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            finished = None in batch
+            if finished:
+                batch = [msg for msg in batch if msg is not None]
+            for _role, _final, encoded in self._coalesce(batch):
+                try:
+                    await self._websocket.send_text(encoded)
+                except Exception as e:
+                    logger.debug("WebSocket send error: {}", e)
+            if finished:
+                return
+
+    def _enqueue(self, role: str, final: bool, payload: dict):
+        """Encode a payload now (it is reused) and queue it for the next flush."""
+        # The browser parses event.data as a string, so keep TEXT frames
+        self._queue.put_nowait((role, final, orjson.dumps(payload).decode()))
+
+    def _send_user_final(self, frame: TranscriptionFrame):
+        """Queue a user final transcription."""
+        payload = self._user_final_payload
+        payload["text"] = frame.text
+        self._enqueue("user", True, payload)
+
+    def _send_user_interim(self, frame: InterimTranscriptionFrame):
+        """Queue a user interim transcription."""
+        payload = self._user_interim_payload
+        payload["text"] = frame.text
+        payload["stability"] = frame.stability if hasattr(frame, 'stability') else None
+        self._enqueue("user", False, payload)
+
+    def _send_assistant(self, frame: TextFrame):
+        """Queue bot response text (from LLM)."""
+        payload = self._assistant_payload
+        payload["text"] = frame.text
+        self._enqueue("assistant", True, payload)
+
+    async def _finish_flushing(self, frame: Frame):
+        """Send whatever is still queued, then let the flush task exit."""
+        if not self._flush_task.done():
+            self._queue.put_nowait(None)
+            await self._flush_task
+
+    def _stop_flushing(self, frame: Frame):
+        """Stop the flush task and drop queued messages (pipeline cancelled)."""
+        self._flush_task.cancel()
+
+    async def cleanup(self):
+        """Cancel the flush task if no EndFrame/CancelFrame stopped it."""
+        if not self._flush_task.done():
+            self._flush_task.cancel()
+        await super().cleanup()
+
+    # Frame type -> handler. Subclasses resolve to their nearest registered
+    # base (e.g. LLMTextFrame -> TextFrame) once, then hit _dispatch_cache.
+    _HANDLERS = {
+        TranscriptionFrame: _send_user_final,
+        InterimTranscriptionFrame: _send_user_interim,
+        TextFrame: _send_assistant,
+        EndFrame: _finish_flushing,
+        CancelFrame: _stop_flushing,
+    }
+    _dispatch_cache: dict[type, Optional[Callable]] = {}
+
+    @classmethod
+    def _resolve_handler(cls, frame_type: type) -> Optional[Callable]:
+        """Find and cache the handler for a frame type by walking its MRO."""
+        handler = next((cls._HANDLERS[base] for base in frame_type.__mro__ if base in cls._HANDLERS), None)
+        cls._dispatch_cache[frame_type] = handler
+        return handler
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        """Process frames and queue transcriptions for the WebSocket."""
+        frame_type = type(frame)
+        try:
+            handler = self._dispatch_cache[frame_type]
+        except KeyError:
+            handler = self._resolve_handler(frame_type)
+        if handler is not None:
+            pending = handler(self, frame)
+            if pending is not None:  # Async handler (EndFrame drain)
+                await pending
         
         # Always pass frame downstream
         await self.push_frame(frame, direction)
 
 
+class CoalescingRTVIObserver(RTVIObserver):
+    """RTVIObserver that sends at most one interim transcript per window.
+    
+    Interim user transcriptions (20-50/s with interim results) are held for
+    FLUSH_INTERVAL and only the latest is sent; a final transcription drops
+    the pending interim it supersedes. Every other message flushes the
+    pending interim first and is sent straight away, so ordering is kept.
+    RTVI clients expect one message per transport frame, so messages are
+    not merged into a single payload.
+    """
+    
+    FLUSH_INTERVAL = 0.02  # Seconds an interim transcript may wait
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_interim = None
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def send_rtvi_message(self, model, exclude_none: bool = True):
+        """Hold interim transcriptions; send everything else in order."""
+        if getattr(model, "type", None) == "user-transcription":
+            if not model.data.final:
+                self._pending_interim = model
+                if self._flush_task is None:
+                    self._flush_task = asyncio.create_task(self._flush_later())
+                return
+            self._pending_interim = None
+        else:
+            await self._flush_interim()
+        await super().send_rtvi_message(model, exclude_none)
+    
+    async def _flush_later(self):
+        """Send the latest interim transcript after FLUSH_INTERVAL."""
+        await asyncio.sleep(self.FLUSH_INTERVAL)
+        self._flush_task = None
+        await self._flush_interim()
+    
+    async def _flush_interim(self):
+        """Send the pending interim transcript, if any."""
+        model, self._pending_interim = self._pending_interim, None
+        if model is not None:
+            await super().send_rtvi_message(model)
+    
+    async def cleanup(self):
+        """Cancel a pending flush and clean up the observer."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await super().cleanup()
+
+
+# Closed set of codes (UI choices + env), so the cache stays tiny and hot
+@lru_cache(maxsize=64)
 def get_language_from_string(lang_str: str):
     """Convert language string to Language enum or return raw string for special cases.
     
@@ -670,49 +1638,53 @@ def get_language_from_string(lang_str: str):
     return mapping.get(lang_str, Language.EN_US)
 
 
-def build_client_ice_servers() -> list[dict]:
-    """Build ICE servers for client (browser) using Twilio or env vars.
+def _fetch_twilio_ice(sid: str, token_auth: str) -> list[dict]:
+    """Fetch TURN credentials from Twilio (blocking; run in a worker thread).
     
+    Args:
+        sid: Twilio account SID
+        token_auth: Twilio auth token
+        
     Returns:
-        List of ICE server configurations for browser
+        List of ICE server configurations, including public STUN fallback
     """
-    # Try Twilio dynamic TURN credentials
-    sid = os.getenv("TWILIO_ACCOUNT_SID")
-    token_auth = os.getenv("TWILIO_AUTH_TOKEN")
+    from twilio.rest import Client
     
-    if sid and token_auth:
-        try:
-            from twilio.rest import Client
-            
-            client = Client(sid, token_auth)
-            token = client.tokens.create()
-            servers: list[dict] = []
-            
-            for s in getattr(token, "ice_servers", []) or []:
-                url_val = s.get("urls") if isinstance(s, dict) else getattr(s, "urls", None)
-                if not url_val:
-                    url_val = s.get("url") if isinstance(s, dict) else getattr(s, "url", None)
-                
-                entry: dict = {"urls": url_val}
-                u = s.get("username") if isinstance(s, dict) else getattr(s, "username", None)
-                c = s.get("credential") if isinstance(s, dict) else getattr(s, "credential", None)
-                
-                if u:
-                    entry["username"] = u
-                if c:
-                    entry["credential"] = c
-                if entry.get("urls"):
-                    servers.append(entry)
-            
-            # Always include public STUN fallback
-            servers.append({"urls": "stun:stun.l.google.com:19302"})
-            logger.info(f"Using Twilio TURN servers ({len(servers)} configured)")
-            return servers
-            
-        except Exception as e:
-            logger.warning(f"Twilio TURN fetch failed, using env vars: {e}")
+    client = Client(sid, token_auth)
+    token = client.tokens.create()
+    servers: list[dict] = []
+    
+    for s in getattr(token, "ice_servers", []) or []:
+        url_val = s.get("urls") if isinstance(s, dict) else getattr(s, "urls", None)
+        if not url_val:
+            url_val = s.get("url") if isinstance(s, dict) else getattr(s, "url", None)
+        
+        entry: dict = {"urls": url_val}
+        u = s.get("username") if isinstance(s, dict) else getattr(s, "username", None)
+        c = s.get("credential") if isinstance(s, dict) else getattr(s, "credential", None)
+        
+        if u:
+            entry["username"] = u
+        if c:
+            entry["credential"] = c
+        if entry.get("urls"):
+            servers.append(entry)
+    
+    # Always include public STUN fallback
+    servers.append({"urls": "stun:stun.l.google.com:19302"})
+    return servers
+
+
+def _build_static_client_ice_servers() -> list[dict]:
+    """Build (once) the fallback ICE servers from env vars or public TURN.
+    
+    Returns:
+        List of ICE server configurations for browser
+    """
+    global _static_client_ice
+    if _static_client_ice is not None:
+        return _static_client_ice
     
-    # Fallback to env vars
     servers: list[dict] = []
     turn_url = os.getenv("TURN_SERVER_URL") or os.getenv("TURN_URL")
     turn_user = os.getenv("TURN_USERNAME") or os.getenv("TURN_USER")
@@ -767,17 +1739,59 @@ def build_client_ice_servers() -> list[dict]:
     
     # Always include public STUN
     servers.append({"urls": "stun:stun.l.google.com:19302"})
+    _static_client_ice = servers
     return servers
 
 
-def build_server_ice_servers() -> list[IceServer]:
+async def build_client_ice_servers() -> list[dict]:
+    """Build ICE servers for client (browser) using Twilio or env vars.
+    
+    Twilio credentials are cached for TWILIO_ICE_CACHE_TTL seconds and
+    fetched off the event loop.
+    
+    Returns:
+        List of ICE server configurations for browser
+    """
+    global _ice_cache
+    
+    # Try Twilio dynamic TURN credentials
+    sid = os.getenv("TWILIO_ACCOUNT_SID")
+    token_auth = os.getenv("TWILIO_AUTH_TOKEN")
+    
+    if sid and token_auth:
+        if _ice_cache and time.monotonic() - _ice_cache[0] < TWILIO_ICE_CACHE_TTL:
+            return _ice_cache[1]
+        
+        async with _ice_cache_lock:
+            # Another request may have refreshed while we waited
+            if _ice_cache and time.monotonic() - _ice_cache[0] < TWILIO_ICE_CACHE_TTL:
+                return _ice_cache[1]
+            try:
+                servers = await asyncio.to_thread(_fetch_twilio_ice, sid, token_auth)
+                _ice_cache = (time.monotonic(), servers)
+                logger.info("Using Twilio TURN servers ({} configured)", len(servers))
+                return servers
+            except Exception as e:
+                logger.warning("Twilio TURN fetch failed, using env vars: {}", e)
+    
+    # Fallback to env vars
+    return _build_static_client_ice_servers()
+
+
+async def build_server_ice_servers() -> list[IceServer]:
     """Convert client ICE configs to server IceServer objects.
     
     Returns:
         List of IceServer objects for Pipecat transport
     """
+    global _server_ice_cache
+    
+    client_servers = await build_client_ice_servers()
+    if _server_ice_cache is not None and _server_ice_cache[0] is client_servers:
+        return _server_ice_cache[1]
+    
     out: list[IceServer] = []
-    for s in build_client_ice_servers():
+    for s in client_servers:
         urls = s.get("urls")
         username = s.get("username", "")
         credential = s.get("credential", "")
@@ -789,9 +1803,151 @@ def build_server_ice_servers() -> list[IceServer]:
         elif isinstance(urls, str) and urls:
             out.append(IceServer(urls=urls, username=username, credential=credential))
     
+    _server_ice_cache = (client_servers, out)
     return out
 
 
+def _log_enabled(level: str) -> bool:
+    """Whether any loguru sink accepts `level` (checked before big log blocks)."""
+    return logger._core.min_level <= logger.level(level).no
+
+
+@lru_cache(maxsize=1)
+def _load_ipa(path: Path) -> dict[str, str]:
+    """Parse the IPA pronunciation dictionary once per process.
+    
+    The returned dict is shared by every connection's TTS service and must
+    not be mutated. Restart the server to pick up edits to the file.
+    
+    Args:
+        path: Path to the JSON dictionary ({word: ipa})
+        
+    Returns:
+        Mapping of word to IPA pronunciation
+    """
+    entries = orjson.loads(path.read_bytes())
+    # Pronunciations repeat a lot across entries; keep one copy of each
+    return {word: sys.intern(ipa) if isinstance(ipa, str) else ipa for word, ipa in entries.items()}
+
+
+@lru_cache(maxsize=1)
+def _cuda_silero_session():
+    """Create the Silero ONNX session shared by every connection on the GPU.
+    
+    Silero's recurrent state lives in each analyzer's model wrapper and is
+    fed in on every call, so the session itself is stateless and safe to
+    share (InferenceSession.run is thread-safe). One session means one CUDA
+    context and one copy of the weights on the device.
+    
+    Returns:
+        onnxruntime.InferenceSession, or None if CUDA isn't available
+    """
+    import onnxruntime
+    from importlib.resources import files
+    
+    if "CUDAExecutionProvider" not in onnxruntime.get_available_providers():
+        logger.warning("⚠️  VAD_DEVICE=cuda but onnxruntime has no CUDA provider, Silero stays on CPU")
+        return None
+    
+    opts = onnxruntime.SessionOptions()
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = 1
+    session = onnxruntime.InferenceSession(
+        str(files("pipecat.audio.vad.data").joinpath("silero_vad.onnx")),
+        providers=[
+            ("CUDAExecutionProvider", {"device_id": 0, "cudnn_conv_algo_search": "HEURISTIC"}),
+            "CPUExecutionProvider",
+        ],
+        sess_options=opts,
+    )
+    logger.info("🎚️  Silero VAD running on {}", session.get_providers()[0])
+    return session
+
+
+def _make_vad() -> VADAnalyzer:
+    """Create the VAD analyzer for one connection (CFG.vad_backend).
+    
+    Returns:
+        TenVadAnalyzer, or Silero (energy-gated unless VAD_ENERGY_GATE=false)
+    """
+    # Conservative settings to avoid splitting utterances mid-speech
+    params = VADParams(
+        confidence=0.5,    # Moderate sensitivity (default: 0.7)
+        start_secs=0.2,    # 200ms detection delay - standard
+        stop_secs=VAD_STOP_SECS[CFG.vad_backend],  # Silence that ends the turn (backend-specific)
+        min_volume=0.5     # Standard volume threshold (default: 0.6)
+    )
+    if CFG.vad_backend == "ten":
+        return TenVadAnalyzer(params=params)
+    if CFG.vad_energy_gate:
+        # Two-stage VAD: only windows with energy above the noise floor reach Silero
+        vad = EnergyGatedSileroVADAnalyzer(params=params, threshold_db=CFG.vad_energy_gate_db)
+    else:
+        vad = SileroVADAnalyzer(params=params)
+    
+    if CFG.vad_device == "cuda":
+        try:
+            session = _cuda_silero_session()
+            if session is not None:
+                vad._model.session = session
+        except Exception as e:
+            logger.warning("Failed to move Silero VAD to GPU, staying on CPU: {}", e)
+    return vad
+
+
+class WarmPool:
+    """Per-connection objects that are slow to build, prepared ahead of offers.
+    
+    Keeps up to `size` objects built by `factory` in worker threads (each
+    VAD analyzer loads its ONNX model). acquire() hands out a ready one and
+    starts building its replacement, so an offer only pays construction
+    cost when a burst drains the pool. Objects are never reused.
+    
+    Example:
+        vad_pool = WarmPool(_make_vad, size=4)
+        vad_pool.refill()              # at startup
+        vad_analyzer = await vad_pool.acquire()
+    """
+    
+    def __init__(self, factory: Callable, size: int):
+        """Initialize the pool.
+        
+        Args:
+            factory: Zero-argument callable creating one object (run in a thread)
+            size: Number of objects to keep ready (0 disables pre-building)
+        """
+        self._factory = factory
+        self._size = size
+        self._ready: deque = deque()
+        self._tasks: set[asyncio.Task] = set()
+    
+    async def _build_one(self):
+        """Build one object in a worker thread and add it to the pool."""
+        try:
+            self._ready.append(await asyncio.to_thread(self._factory))
+        except Exception as e:
+            logger.warning("Failed to pre-build pooled object: {}", e)
+    
+    def refill(self):
+        """Start builds until ready + in-flight objects reach the pool size."""
+        while len(self._ready) + len(self._tasks) < self._size:
+            task = asyncio.create_task(self._build_one())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def acquire(self):
+        """Take a ready object, or build one in a worker thread if the pool is empty."""
+        if self._ready:
+            item = self._ready.popleft()
+        else:
+            item = await asyncio.to_thread(self._factory)
+        self.refill()
+        return item
+
+
+_vad_pool = WarmPool(_make_vad, size=CFG.pipeline_pool)
+
+
 async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSocket] = None, assistant_override: Optional[str] = None, language_override: Optional[str] = None):
     """Run the voice agent pipeline.
     
@@ -801,36 +1957,42 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         assistant_override: Optional assistant name override from client
         language_override: Optional language code override from client (e.g. 'en-US', 'es-ES', 'multi')
     """
-    stream_id = uuid.uuid4()
+    stream_id = f"{os.getpid()}-{next(_stream_counter)}"
+    # The setup diagnostics below format dozens of strings; skip them all
+    # when INFO is filtered out
+    log_setup = _log_enabled("INFO")
     
     logger.info("=" * 80)
-    logger.info(f"🚀 Starting voice agent bot (stream_id: {stream_id})")
+    logger.info("🚀 Starting voice agent bot (stream_id: {})", stream_id)
     logger.info("=" * 80)
     
     # Log language selection source
     if language_override:
-        logger.info(f"📱 Language from UI: '{language_override}'")
+        logger.info("📱 Language from UI: '{}'", language_override)
     else:
-        logger.info(f"⚙️  No language from UI, using environment variable")
+        logger.info("⚙️  No language from UI, using environment variable")
     
     # Transport configuration
-    sample_rate = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+    sample_rate = CFG.sample_rate
     
-    # Configure VAD (Voice Activity Detection) parameters
-    # Conservative settings to avoid splitting utterances mid-speech
+    # Configure VAD (Voice Activity Detection) - pre-built by the warm pool
     logger.info("")
     logger.info("🎚️  VAD CONFIGURATION:")
-    vad_params = VADParams(
-        confidence=0.5,    # Moderate sensitivity (default: 0.7)
-        start_secs=0.2,    # 200ms detection delay - standard
-        stop_secs=1.8,     # Wait 1.8s of silence - more patient for natural pauses
-        min_volume=0.5     # Standard volume threshold (default: 0.6)
-    )
-    logger.info(f"   • Confidence: {vad_params.confidence} (lower = more sensitive)")
-    logger.info(f"   • Start threshold: {vad_params.start_secs}s (speech detection delay)")
-    logger.info(f"   • Stop threshold: {vad_params.stop_secs}s (patience for natural pauses)")
-    logger.info(f"   • Min volume: {vad_params.min_volume} (volume threshold)")
-    logger.info(f"   ℹ️  Conservative settings to avoid mid-speech splits")
+    vad_backend = CFG.vad_backend
+    vad_analyzer = await _vad_pool.acquire()
+    complete_secs, incomplete_secs = ADAPTIVE_STOP_SECS[vad_backend]
+    if log_setup:
+        vad_params = vad_analyzer.params
+        logger.info("   • Backend: {}", vad_backend)
+        logger.info("   • Confidence: {} (lower = more sensitive)", vad_params.confidence)
+        logger.info("   • Start threshold: {}s (speech detection delay)", vad_params.start_secs)
+        logger.info("   • Stop threshold: {}s (patience for natural pauses)", vad_params.stop_secs)
+        logger.info("   • Min volume: {} (volume threshold)", vad_params.min_volume)
+        logger.info("   ℹ️  Conservative settings to avoid mid-speech splits")
+        if isinstance(vad_analyzer, EnergyGatedSileroVADAnalyzer):
+            logger.info("   • Energy gate: +{} dB over noise floor", CFG.vad_energy_gate_db)
+        if CFG.adaptive_vad:
+            logger.info("   • Adaptive stop: {}s after a full sentence, {}s mid-clause", complete_secs, incomplete_secs)
     logger.info("")
     
     transport_params = TransportParams(
@@ -838,8 +2000,10 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         audio_in_sample_rate=sample_rate,
         audio_out_sample_rate=sample_rate,
         audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(params=vad_params),
-        audio_out_10ms_chunks=5,
+        vad_analyzer=vad_analyzer,
+        # TTS audio is sent in N x 10ms packets; the browser's jitter buffer
+        # already smooths playback, so small packets just cut latency
+        audio_out_10ms_chunks=CFG.audio_out_10ms_chunks,
     )
     
     transport = SmallWebRTCTransport(
@@ -848,36 +2012,36 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     )
     
     # LLM Configuration - choose between OpenAI or LangGraph
-    use_simple_llm = os.getenv("USE_SIMPLE_LLM", "false").lower() == "true"
+    use_simple_llm = CFG.use_simple_llm
     
     if use_simple_llm:
         # Simple OpenAI LLM for testing
         logger.info("🤖 Using OpenAI LLM (simple mode)")
-        openai_api_key = os.getenv("OPENAI_API_KEY")
+        openai_api_key = CFG.openai_api_key
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY required when USE_SIMPLE_LLM=true")
         
         llm = OpenAILLMService(
             api_key=openai_api_key,
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+            model=CFG.openai_model
         )
-        logger.info(f"   Model: {os.getenv('OPENAI_MODEL', 'gpt-4o-mini')}")
+        logger.info("   Model: {}", CFG.openai_model)
     else:
         # LangGraph LLM Service
-        selected_assistant = assistant_override or os.getenv("LANGGRAPH_ASSISTANT", "simple_agent")
-        langgraph_base_url = os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024")
+        selected_assistant = assistant_override or CFG.langgraph_assistant
+        langgraph_base_url = CFG.langgraph_base_url
         
-        logger.info(f"📚 Using LangGraph assistant: {selected_assistant}")
-        logger.info(f"   URL: {langgraph_base_url}")
+        logger.info("📚 Using LangGraph assistant: {}", selected_assistant)
+        logger.info("   URL: {}", langgraph_base_url)
         
         llm = LangGraphLLMService(
             base_url=langgraph_base_url,
             assistant=selected_assistant,
-            user_email=os.getenv("USER_EMAIL", "test@example.com"),
-            stream_mode=os.getenv("LANGGRAPH_STREAM_MODE", "messages"),
-            debug_stream=os.getenv("LANGGRAPH_DEBUG_STREAM", "false").lower() == "true",
+            user_email=CFG.user_email,
+            stream_mode=CFG.langgraph_stream_mode,
+            debug_stream=CFG.langgraph_debug_stream,
         )
-        logger.info(f"   Stream mode: {os.getenv('LANGGRAPH_STREAM_MODE', 'messages')}")
+        logger.info("   Stream mode: {}", CFG.langgraph_stream_mode)
 
 
     
@@ -885,25 +2049,29 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     logger.info("🎤 Creating Riva STT service...")
     
     # Use language override from client if provided, otherwise fall back to env variable
-    env_language = os.getenv("RIVA_ASR_LANGUAGE", "en-US")
+    env_language = CFG.asr_language
     language_code = language_override or env_language
+    # Swap the client's string for the canonical object: the voice-map and
+    # Language lookups below then match keys by identity
+    language_code = _INTERNED_LANGUAGE_CODES.get(language_code, language_code)
     
     # Check if using Mandarin in language-specific mode (NOT multi)
     # Mandarin requires a different NVCF endpoint AND a different API key
     use_mandarin_endpoint = (language_code == "zh-CN")
     
     # Log ASR configuration for debugging
-    asr_server = os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443")
+    asr_server = CFG.asr_url
     
     if use_mandarin_endpoint:
         # Mandarin-specific ASR endpoint (language-specific mode only)
         # Uses separate function ID and API key
-        asr_function_id = os.getenv("NVIDIA_ASR_MANDARIN_FUNCTION_ID")
+        asr_function_id = CFG.asr_mandarin_function_id
         if not asr_function_id:
             raise ValueError("NVIDIA_ASR_MANDARIN_FUNCTION_ID environment variable required for Mandarin ASR")
         
         # Mandarin uses its own API key
-        nvidia_asr_api_key = os.getenv("NVIDIA_RIVA_MANDARIN_API_KEY")
+        nvidia_asr_api_key = CFG.asr_mandarin_api_key
+        asr_api_key_masked = CFG.asr_mandarin_api_key_masked
         if not nvidia_asr_api_key:
             raise ValueError("NVIDIA_RIVA_MANDARIN_API_KEY environment variable required for Mandarin ASR")
         
@@ -912,31 +2080,29 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         logger.info("   🇨🇳 Using Mandarin-specific API key")
     else:
         # Default ASR endpoint (all other languages)
-        asr_function_id = os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409")
-        asr_model_name = os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble")
+        asr_function_id = CFG.asr_function_id
+        asr_model_name = CFG.asr_model
         
-        # Support separate ASR key or fall back to general NVIDIA key
-        nvidia_asr_api_key = (
-            os.getenv("NVIDIA_ASR_API_KEY") 
-            or os.getenv("NVIDIA_API_KEY")
-        )
+        nvidia_asr_api_key = CFG.asr_api_key
+        asr_api_key_masked = CFG.asr_api_key_masked
         if not nvidia_asr_api_key:
             raise ValueError("NVIDIA_ASR_API_KEY or NVIDIA_API_KEY environment variable required")
     
-    logger.info(f"   🔑 NGC API Key: {nvidia_asr_api_key[:10]}...{nvidia_asr_api_key[-8:]}")
-    logger.info(f"   🆔 Function ID: {asr_function_id}")
-    logger.info(f"   🖥️  Server: {asr_server}")
-    if asr_model_name:
-        logger.info(f"   📦 Model: {asr_model_name}")
-    else:
-        logger.info(f"   📦 Model: (using default at endpoint)")
+    if log_setup:
+        logger.info("   🔑 NGC API Key: {}", asr_api_key_masked)
+        logger.info("   🆔 Function ID: {}", asr_function_id)
+        logger.info("   🖥️  Server: {}", asr_server)
+        if asr_model_name:
+            logger.info("   📦 Model: {}", asr_model_name)
+        else:
+            logger.info("   📦 Model: (using default at endpoint)")
     
-    logger.info("")
-    logger.info("🌐 LANGUAGE CONFIGURATION:")
-    logger.info(f"   • Environment variable (RIVA_ASR_LANGUAGE): {env_language}")
-    logger.info(f"   • UI override: {language_override or 'None'}")
-    logger.info(f"   ➡️  SELECTED LANGUAGE: '{language_code}'")
-    logger.info("")
+        logger.info("")
+        logger.info("🌐 LANGUAGE CONFIGURATION:")
+        logger.info("   • Environment variable (RIVA_ASR_LANGUAGE): {}", env_language)
+        logger.info("   • UI override: {}", language_override or 'None')
+        logger.info("   ➡️  SELECTED LANGUAGE: '{}'", language_code)
+        logger.info("")
     
     stt_language = get_language_from_string(language_code)
     enable_language_detection = stt_language == "multi"
@@ -945,40 +2111,35 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     # The actual language code "multi" will be set via custom_configuration
     stt_params_language = Language.EN_US if enable_language_detection else stt_language
     
-    # Build custom configuration for Riva ASR
-    # NOTE: Riva VAD is RE-ENABLED because disabling it causes truncated final transcripts
-    # Riva needs its VAD to properly finalize utterances even when Pipecat VAD triggers
-    custom_config = os.getenv("RIVA_ASR_CUSTOM_CONFIG", 
-                              "enable_vad_endpointing:true,neural_vad.onset:0.5,apply_partial_itn:true")
-    
-    logger.info("")
-    logger.info("🎚️  RIVA ASR CONFIGURATION:")
-    logger.info(f"   • Custom config: {custom_config}")
-    logger.info("   ℹ️  Riva VAD enabled with onset=0.5 (needed for proper finalization)")
-    
-    if enable_language_detection:
-        # Add language detection configuration
-        if custom_config:
-            custom_config += ",enable_automatic_language_detection:true"
+    # Custom configuration for Riva ASR (both variants prebuilt in PipelineConfig)
+    # NOTE: Passed as the "k:v,k:v" string on purpose. Pipecat's Riva STT only
+    # accepts the string and expands it into RecognitionConfig.custom_configuration
+    # while building its config; the multi-language mode is keyed off it too.
+    # The strings are built once per process, so sessions share them.
+    # Add language detection configuration in multi-language mode
+    custom_config = CFG.asr_custom_config_multi if enable_language_detection else CFG.asr_custom_config
+    if log_setup:
+        logger.info("")
+        logger.info("🎚️  RIVA ASR CONFIGURATION:")
+        logger.info("   • Custom config: {}", CFG.asr_custom_config)
+        logger.info("   ℹ️  Riva VAD enabled with onset=0.5 (needed for proper finalization)")
+        if enable_language_detection:
+            logger.info("   🌐 MODE: Multi-language auto-detection enabled")
         else:
-            custom_config = "enable_automatic_language_detection:true"
-        logger.info("   🌐 MODE: Multi-language auto-detection enabled")
-        logger.info(f"   ⚙️  Final config: {custom_config}")
-    else:
-        logger.info(f"   🎯 MODE: Single language (language-specific)")
-        logger.info(f"   ⚙️  Final config: {custom_config}")
-    logger.info("")
+            logger.info("   🎯 MODE: Single language (language-specific)")
+        logger.info("   ⚙️  Final config: {}", custom_config)
+        logger.info("")
     
-    # Text-based validation option (requires langdetect)
+    # Text-based validation option (requires fasttext or langdetect)
     # NOTE: Disabled for Mandarin - langdetect may not work well with Chinese characters
     # and we already know the language in language-specific mode
-    validate_with_text = os.getenv("VALIDATE_LANGUAGE_WITH_TEXT", "true").lower() == "true"
+    validate_with_text = CFG.validate_language_with_text
     if use_mandarin_endpoint:
         validate_with_text = False
         logger.info("   🇨🇳 Text validation disabled for Mandarin (not needed in language-specific mode)")
-    elif validate_with_text and not LANGDETECT_AVAILABLE:
-        logger.warning("⚠️  VALIDATE_LANGUAGE_WITH_TEXT=true but langdetect not installed")
-        logger.warning("   Install with: pip install langdetect")
+    elif validate_with_text and not TEXT_LID_AVAILABLE:
+        logger.warning("⚠️  VALIDATE_LANGUAGE_WITH_TEXT=true but neither fasttext nor langdetect is installed")
+        logger.warning("   Install with: pip install fasttext-wheel (or langdetect)")
         validate_with_text = False
     elif validate_with_text:
         logger.info("   ✅ Text-based language validation enabled")
@@ -999,10 +2160,11 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         ),
         custom_configuration=custom_config,
         interim_results=True,
-        automatic_punctuation=os.getenv("RIVA_ASR_AUTO_PUNCTUATION", "true").lower() == "true",
-        profanity_filter=os.getenv("RIVA_ASR_PROFANITY_FILTER", "false").lower() == "true",
-        log_detected_language=enable_language_detection or os.getenv("LOG_DETECTED_LANGUAGE", "true").lower() == "true",
+        automatic_punctuation=CFG.asr_auto_punctuation,
+        profanity_filter=CFG.asr_profanity_filter,
+        log_detected_language=enable_language_detection or CFG.log_detected_language,
         validate_with_text=validate_with_text,
+        always_validate=CFG.langdetect_always,
     )
     
     # Fix for Mandarin: Pipecat's language_to_riva_language doesn't map Language.ZH to "zh-CN"
@@ -1013,93 +2175,70 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         # Also update the config object that was already created with the wrong language
         if hasattr(stt, '_config') and stt._config is not None:
             stt._config.config.language_code = "zh-CN"
-            logger.info(f"   🇨🇳 Overriding language code to 'zh-CN' in both _language_code and _config")
+            logger.info("   🇨🇳 Overriding language code to 'zh-CN' in both _language_code and _config")
         else:
-            logger.info(f"   🇨🇳 Overriding language code to 'zh-CN' for Mandarin endpoint")
+            logger.info("   🇨🇳 Overriding language code to 'zh-CN' for Mandarin endpoint")
     
-    logger.info(f"   ✅ Riva STT Service created")
-    if enable_language_detection:
-        logger.info(f"   📝 Language: MULTI (auto-detect any language)")
-    else:
-        logger.info(f"   📝 Language: {stt._language_code} (language-specific mode)")
-    logger.info(f"   🎵 Sample rate: {stt._sample_rate}Hz")
-    logger.info(f"   🔧 Interim results: {stt._interim_results}")
-    logger.info(f"   🔧 Auto punctuation: {os.getenv('RIVA_ASR_AUTO_PUNCTUATION', 'true')}")
-    logger.info("")
+    if CFG.share_riva_channels:
+        try:
+            shared = use_shared_riva_channel(
+                getattr(stt, "_asr_service", None),
+                shared_riva_auth(asr_server, asr_function_id, nvidia_asr_api_key),
+            )
+            logger.debug("   🔗 STT shared gRPC channel: {}", shared)
+        except Exception as e:
+            logger.warning("⚠️ Could not share STT gRPC channel: {}", e)
+    
+    if log_setup:
+        logger.info("   ✅ Riva STT Service created")
+        if enable_language_detection:
+            logger.info("   📝 Language: MULTI (auto-detect any language)")
+        else:
+            logger.info("   📝 Language: {} (language-specific mode)", stt._language_code)
+        logger.info("   🎵 Sample rate: {}Hz", stt._sample_rate)
+        logger.info("   🔧 Interim results: {}", stt._interim_results)
+        logger.info("   🔧 Auto punctuation: {}", CFG.asr_auto_punctuation)
+        logger.info("")
     
     # NVIDIA Riva TTS (Text-to-Speech)
     logger.info("🔊 Creating Riva TTS service...")
     
-    # Support separate TTS key or fall back to general NVIDIA key
-    nvidia_tts_api_key = (
-        os.getenv("NVIDIA_TTS_API_KEY")
-        or os.getenv("NVIDIA_API_KEY")
-    )
+    nvidia_tts_api_key = CFG.tts_api_key
     if not nvidia_tts_api_key:
         raise ValueError("NVIDIA_TTS_API_KEY or NVIDIA_API_KEY environment variable required")
     
     # Log TTS configuration for debugging
-    tts_function_id = os.getenv("NVIDIA_TTS_FUNCTION_ID", "c811837c-3343-42d9-83ef-a0a9e8f2be8c")
-    tts_model_name = os.getenv("RIVA_TTS_MODEL", "magpie-tts-multilingual")
-    tts_server = os.getenv("RIVA_TTS_URL", "grpc.nvcf.nvidia.com:443")
+    tts_function_id = CFG.tts_function_id
+    tts_model_name = CFG.tts_model
+    tts_server = CFG.tts_url
     
     # Select default voice based on the selected language (if in language-specific mode)
     # Otherwise use env variable or default to English
-    # IMPORTANT: This must match LanguageAdaptiveTTSService.LANGUAGE_CONFIG_MAP exactly!
-    # Maps ALL language code variants to appropriate Magpie voices
-    # Note: Magpie Multilingual only supports 5 languages: en-US, es-US, fr-FR, de-DE, zh-CN
-    default_voice_map = {
-        # English (female - Mia)
-        "en-US": "Magpie-Multilingual.EN-US.Mia.Neutral",
-        "en-GB": "Magpie-Multilingual.EN-US.Mia.Neutral",  # UK → US voice
-        
-        # Spanish (female - Isabela)
-        "es-US": "Magpie-Multilingual.ES-US.Isabela",
-        "es-ES": "Magpie-Multilingual.ES-US.Isabela",      # Spain → US voice (same as adaptive)
-        
-        # French (male - Pascal) 👨 - Only male voice!
-        "fr-FR": "Magpie-Multilingual.FR-FR.Pascal",
-        
-        # German (female - Aria) - Match LanguageAdaptiveTTSService
-        "de-DE": "Magpie-Multilingual.DE-DE.Aria",
-        
-        # Chinese (female - Mia)
-        "zh-CN": "Magpie-Multilingual.ZH-CN.Mia",
-        "zh-TW": "Magpie-Multilingual.ZH-CN.Mia",     # Traditional → Simplified voice
-        
-        # Unsupported languages - fallback to English (Mia)
-        # These languages will use English voice to speak the foreign text
-        "pt-BR": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Portuguese → English voice
-        "it-IT": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Italian → English voice
-        "ja-JP": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Japanese → English voice
-        "ko-KR": "Magpie-Multilingual.EN-US.Mia.Neutral",  # Korean → English voice
-    }
-    
     # Use language from UI selection if not in multi mode
     selected_lang_for_voice = language_code if not enable_language_detection else "en-US"
     
-    logger.info("")
-    logger.info("🎙️  VOICE SELECTION DEBUG:")
-    logger.info(f"   • language_code (from UI/env): {language_code}")
-    logger.info(f"   • enable_language_detection: {enable_language_detection}")
-    logger.info(f"   • selected_lang_for_voice: {selected_lang_for_voice}")
-    logger.info(f"   • Looking up in default_voice_map: '{selected_lang_for_voice}'")
-    
-    default_voice_for_lang = default_voice_map.get(selected_lang_for_voice, "Magpie-Multilingual.EN-US.Mia.Neutral")
-    logger.info(f"   • Found voice in map: {default_voice_for_lang}")
-    
-    tts_voice_id = os.getenv("RIVA_TTS_VOICE_ID", default_voice_for_lang)
-    logger.info(f"   • ENV override (RIVA_TTS_VOICE_ID): {os.getenv('RIVA_TTS_VOICE_ID', 'None - using default')}")
-    logger.info(f"   • FINAL voice_id to use: {tts_voice_id}")
-    logger.info("")
-    
-    logger.info(f"   🔑 NGC API Key: {nvidia_tts_api_key[:10]}...{nvidia_tts_api_key[-8:]}")
-    logger.info(f"   🆔 Function ID: {tts_function_id}")
-    logger.info(f"   🖥️  Server: {tts_server}")
-    logger.info(f"   📦 Model: {tts_model_name}")
-    logger.info(f"   🎙️  Voice: {tts_voice_id}")
-    if not enable_language_detection:
-        logger.info(f"   🎤 Voice auto-selected for language: {selected_lang_for_voice}")
+    default_voice_for_lang = _lookup_voice(selected_lang_for_voice, "Magpie-Multilingual.EN-US.Mia.Neutral")
+    tts_voice_id = CFG.tts_voice_id or default_voice_for_lang
+    
+    if log_setup:
+        logger.info("")
+        logger.info("🎙️  VOICE SELECTION DEBUG:")
+        logger.info("   • language_code (from UI/env): {}", language_code)
+        logger.info("   • enable_language_detection: {}", enable_language_detection)
+        logger.info("   • selected_lang_for_voice: {}", selected_lang_for_voice)
+        logger.info("   • Looking up in DEFAULT_VOICE_MAP: '{}'", selected_lang_for_voice)
+        logger.info("   • Found voice in map: {}", default_voice_for_lang)
+        logger.info("   • ENV override (RIVA_TTS_VOICE_ID): {}", CFG.tts_voice_id or 'None - using default')
+        logger.info("   • FINAL voice_id to use: {}", tts_voice_id)
+        logger.info("")
+        
+        logger.info("   🔑 NGC API Key: {}", CFG.tts_api_key_masked)
+        logger.info("   🆔 Function ID: {}", tts_function_id)
+        logger.info("   🖥️  Server: {}", tts_server)
+        logger.info("   📦 Model: {}", tts_model_name)
+        logger.info("   🎙️  Voice: {}", tts_voice_id)
+        if not enable_language_detection:
+            logger.info("   🎤 Voice auto-selected for language: {}", selected_lang_for_voice)
     
     # TTS doesn't support "multi" - always needs a valid language enum
     # When using language-adaptive TTS, this is just the initial/default language
@@ -1111,29 +2250,23 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     else:
         # Language-specific mode: use the selected language
         tts_language_str = language_code  # Use the same language as STT
-        logger.info(f"   🎯 Language-specific mode: TTS using {tts_language_str}")
+        logger.info("   🎯 Language-specific mode: TTS using {}", tts_language_str)
     
     tts_language = get_language_from_string(tts_language_str)
     
     # Load IPA dictionary if configured
     ipa_dict = {}
-    ipa_file_path = os.getenv("IPA_DICT_FILE")
-    if ipa_file_path:
-        ipa_file = Path(ipa_file_path)
-        if ipa_file.exists():
-            try:
-                with open(ipa_file, encoding="utf-8") as f:
-                    ipa_dict = json.load(f)
-                logger.info(f"   Loaded IPA dictionary: {len(ipa_dict)} entries")
-            except Exception as e:
-                logger.warning(f"Failed to load IPA dictionary: {e}")
+    if CFG.ipa_dict_file is not None:
+        try:
+            ipa_dict = _load_ipa(CFG.ipa_dict_file)
+            logger.info("   Loaded IPA dictionary: {} entries", len(ipa_dict))
+        except Exception as e:
+            logger.warning("Failed to load IPA dictionary: {}", e)
     
     # Zero-shot audio prompt (optional)
-    zero_shot_prompt = None
-    zero_shot_path = os.getenv("ZERO_SHOT_AUDIO_PROMPT")
-    if zero_shot_path and Path(zero_shot_path).exists():
-        zero_shot_prompt = Path(zero_shot_path)
-        logger.info(f"   Using zero-shot audio prompt: {zero_shot_prompt}")
+    zero_shot_prompt = CFG.zero_shot_audio_prompt
+    if zero_shot_prompt is not None:
+        logger.info("   Using zero-shot audio prompt: {}", zero_shot_prompt)
     
     # Use language-adaptive TTS when multi-language detection is enabled
     if enable_language_detection:
@@ -1150,7 +2283,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
             },
             params=RivaTTSService.InputParams(
                 language=tts_language,  # Valid Language enum (never "multi")
-                quality=int(os.getenv("RIVA_TTS_QUALITY", "20"))
+                quality=CFG.tts_quality
             ),
             custom_dictionary=ipa_dict if ipa_dict else None,
             zero_shot_audio_prompt_file=zero_shot_prompt,
@@ -1159,12 +2292,13 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         )
     else:
         # Standard TTS without language adaptation
-        logger.info("   🎯 Standard TTS (language-specific mode)")
-        logger.info("   📝 Creating RivaTTSService...")
-        logger.info(f"   🔊 CRITICAL TTS PARAMETERS:")
-        logger.info(f"      • voice_id: {tts_voice_id}")
-        logger.info(f"      • language: {tts_language} (enum: {tts_language_str})")
-        logger.info(f"      • sample_rate: {sample_rate}")
+        if log_setup:
+            logger.info("   🎯 Standard TTS (language-specific mode)")
+            logger.info("   📝 Creating RivaTTSService...")
+            logger.info("   🔊 CRITICAL TTS PARAMETERS:")
+            logger.info("      • voice_id: {}", tts_voice_id)
+            logger.info("      • language: {} (enum: {})", tts_language, tts_language_str)
+            logger.info("      • sample_rate: {}", sample_rate)
         
         tts = RivaTTSService(
             api_key=nvidia_tts_api_key,
@@ -1177,7 +2311,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
             },
             params=RivaTTSService.InputParams(
                 language=tts_language,
-                quality=int(os.getenv("RIVA_TTS_QUALITY", "20"))
+                quality=CFG.tts_quality
             ),
             custom_dictionary=ipa_dict if ipa_dict else None,
             zero_shot_audio_prompt_file=zero_shot_prompt,
@@ -1186,21 +2320,28 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     # Fix for Mandarin TTS: Same as STT, Pipecat's language_to_riva_language doesn't map Language.ZH to "zh-CN"
     if use_mandarin_endpoint:
         tts._language_code = "zh-CN"
-        logger.info(f"   🇨🇳 Overriding TTS language code to 'zh-CN' for Mandarin")
+        logger.info("   🇨🇳 Overriding TTS language code to 'zh-CN' for Mandarin")
+    
+    if CFG.share_riva_channels:
+        try:
+            shared = use_shared_riva_channel(
+                getattr(tts, "_service", None),
+                shared_riva_auth(tts_server, tts_function_id, nvidia_tts_api_key),
+            )
+            logger.debug("   🔗 TTS shared gRPC channel: {}", shared)
+        except Exception as e:
+            logger.warning("⚠️ Could not share TTS gRPC channel: {}", e)
     
-    logger.info(f"   ✅ TTS Service created")
-    logger.info(f"   📝 Final TTS Language Code: {tts._language_code}")
-    logger.info(f"   🎙️  Final TTS Voice ID: {tts._voice_id}")
-    logger.info(f"   🎵 Sample rate: {tts._sample_rate}Hz")
+    if log_setup:
+        logger.info("   ✅ TTS Service created")
+        logger.info("   📝 Final TTS Language Code: {}", tts._language_code)
+        logger.info("   🎙️  Final TTS Voice ID: {}", tts._voice_id)
+        logger.info("   🎵 Sample rate: {}Hz", tts._sample_rate)
     
     # Create context with initial system prompt
     if use_simple_llm:
         # Add system prompt for OpenAI
-        system_prompt = os.getenv(
-            "SYSTEM_PROMPT",
-            "You are a helpful AI voice assistant. Keep your responses concise and natural "
-            "for voice conversation. Be friendly and engaging."
-        )
+        system_prompt = CFG.system_prompt
         context = OpenAILLMContext([
             {"role": "system", "content": system_prompt}
         ])
@@ -1211,6 +2352,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     
     # Store context for WebSocket access
     pc_id = webrtc_connection.pc_id
+    webrtc_connection._llm_context = context
     contexts_map[pc_id] = context
     
     # Create context aggregator (standard pipecat)
@@ -1219,7 +2361,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     # Create transcription logger for debugging (optional)
     # Note: Disabled for now due to Pipecat StartFrame handling
     # Will add back with proper event observer pattern in future
-    enable_transcription_logging = os.getenv("TRANSCRIPTION_LOGGING", "false").lower() == "true"
+    enable_transcription_logging = CFG.transcription_logging
     if enable_transcription_logging:
         logger.warning("⚠️  Transcription logging is currently disabled (Pipecat compatibility issue)")
     
@@ -1232,11 +2374,11 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
     # Create gain processor for TTS output volume boost
     # Configurable via TTS_OUTPUT_GAIN environment variable (default: 1.0 = no change)
     # Recommended values: 1.5 (50% louder), 2.0 (100% louder), 2.5 (150% louder)
-    tts_gain = float(os.getenv("TTS_OUTPUT_GAIN", "1.0"))
+    tts_gain = CFG.tts_output_gain
     gain_processor = GainProcessor(gain=tts_gain)
     
     if tts_gain != 1.0:
-        logger.info(f"🔊 TTS Output Gain: {tts_gain:.2f}x")
+        logger.info("🔊 TTS Output Gain: {:.2f}x", tts_gain)
     
     pipeline_processors = [
         transport.input(),              # WebRTC audio input
@@ -1249,6 +2391,13 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         gain_processor,                # Apply gain to TTS output (configurable)
     ]
     
+    # Retune the VAD end-of-turn tail from ASR interims (right after STT)
+    if CFG.adaptive_vad:
+        pipeline_processors.insert(
+            pipeline_processors.index(stt) + 1,
+            AdaptiveEndpointing(vad_analyzer, complete_secs, incomplete_secs),
+        )
+    
     # Add transcript output if WebSocket is provided (optional, for debugging)
     if ws:
         transcript_output = WebsocketTranscriptOutput(ws)
@@ -1271,7 +2420,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
             enable_usage_metrics=True,
             send_initial_empty_metrics=False,
         ),
-        observers=[RTVIObserver(rtvi_processor)],
+        observers=[CoalescingRTVIObserver(rtvi_processor)],
     )
     
     # Set up RTVI event handlers
@@ -1280,7 +2429,7 @@ async def run_bot(webrtc_connection: SmallWebRTCConnection, ws: Optional[WebSock
         logger.info("🎯 RTVI client ready")
         await rtvi.set_bot_ready()
     
-    logger.info(f"✅ Voice agent ready with RTVI observers (pc_id: {pc_id})")
+    logger.info("✅ Voice agent ready with RTVI observers (pc_id: {})", pc_id)
     
     # Run the pipeline
     runner = PipelineRunner(handle_sigint=False)
@@ -1308,10 +2457,10 @@ async def api_offer(
         WebRTC answer with pc_id
     """
     logger.info("=" * 80)
-    logger.info(f"📞 API /api/offer REQUEST:")
-    logger.info(f"   • Body keys: {list(request.keys())}")
-    logger.info(f"   • Query param - language: {language}")
-    logger.info(f"   • Query param - assistant: {assistant}")
+    logger.info("📞 API /api/offer REQUEST:")
+    logger.info("   • Body keys: {}", list(request.keys()))
+    logger.info("   • Query param - language: {}", language)
+    logger.info("   • Query param - assistant: {}", assistant)
     logger.info("=" * 80)
     
     pc_id = request.get("pc_id")
@@ -1321,16 +2470,16 @@ async def api_offer(
     assistant_from_client = assistant or request.get("assistant")
     
     logger.info("=" * 80)
-    logger.info(f"📞 API /api/offer FINAL PARAMS:")
-    logger.info(f"   • pc_id: {pc_id}")
-    logger.info(f"   • assistant: {assistant_from_client or 'None (using default)'}")
-    logger.info(f"   • language: {language_from_client or 'None (will use env variable)'}")
+    logger.info("📞 API /api/offer FINAL PARAMS:")
+    logger.info("   • pc_id: {}", pc_id)
+    logger.info("   • assistant: {}", assistant_from_client or 'None (using default)')
+    logger.info("   • language: {}", language_from_client or 'None (will use env variable)')
     logger.info("=" * 80)
     
     if pc_id and pc_id in pcs_map:
         # Reuse existing connection
         pipecat_connection = pcs_map[pc_id]
-        logger.info(f"Reusing existing connection for pc_id: {pc_id}")
+        logger.info("Reusing existing connection for pc_id: {}", pc_id)
         await pipecat_connection.renegotiate(
             sdp=request["sdp"],
             type=request["type"],
@@ -1338,17 +2487,11 @@ async def api_offer(
         )
     else:
         # Create new WebRTC connection
-        ice_servers = build_server_ice_servers()
+        ice_servers = await build_server_ice_servers()
         pipecat_connection = SmallWebRTCConnection(ice_servers)
+        pipecat_connection.add_event_handler("closed", _on_connection_closed)
         await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
         
-        # Setup disconnect handler
-        @pipecat_connection.event_handler("closed")
-        async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-            logger.info(f"Connection closed for pc_id: {webrtc_connection.pc_id}")
-            pcs_map.pop(webrtc_connection.pc_id, None)
-            contexts_map.pop(webrtc_connection.pc_id, None)
-        
         # Start bot pipeline in background (no WebSocket for standard UI)
         background_tasks.add_task(run_bot, pipecat_connection, None, assistant_from_client, language_from_client)
     
@@ -1374,10 +2517,10 @@ async def api_offer_patch(request: dict):
     pc_id = request.get("pc_id")
     
     # Log what we received for debugging
-    logger.info(f"📥 PATCH /api/offer - keys: {list(request.keys())}, pc_id: {pc_id}")
+    logger.info("📥 PATCH /api/offer - keys: {}, pc_id: {}", list(request.keys()), pc_id)
     
     if not pc_id or pc_id not in pcs_map:
-        logger.warning(f"PATCH request for unknown pc_id: {pc_id}")
+        logger.warning("PATCH request for unknown pc_id: {}", pc_id)
         return JSONResponse({"error": "Connection not found"}, status_code=404)
     
     pipecat_connection = pcs_map[pc_id]
@@ -1386,25 +2529,25 @@ async def api_offer_patch(request: dict):
     if "candidates" in request:
         candidates = request["candidates"]
         if isinstance(candidates, list):
-            logger.info(f"🧊 Received {len(candidates)} ICE candidates for {pc_id}")
+            logger.info("🧊 Received {} ICE candidates for {}", len(candidates), pc_id)
             for i, candidate in enumerate(candidates):
-                logger.info(f"   Candidate {i} raw: {candidate}")
+                logger.info("   Candidate {} raw: {}", i, candidate)
                 if candidate:
                     candidate_str = candidate.get("candidate", "") if isinstance(candidate, dict) else ""
                     if candidate_str:
-                        logger.info(f"   Adding: {candidate_str[:60]}...")
+                        logger.info("   Adding: {}...", candidate_str[:60])
                         await pipecat_connection.add_ice_candidate(candidate)
     
     # Handle single ICE candidate (for compatibility)
     if "candidate" in request:
         candidate = request["candidate"]
         candidate_str = candidate.get("candidate", "") if candidate else ""
-        logger.info(f"🧊 ICE candidate received for {pc_id}: {candidate_str[:80] if candidate_str else 'empty'}")
+        logger.info("🧊 ICE candidate received for {}: {}", pc_id, candidate_str[:80] if candidate_str else 'empty')
         await pipecat_connection.add_ice_candidate(candidate)
     
     # Handle renegotiation if SDP provided
     if "sdp" in request:
-        logger.info(f"🔄 Renegotiating connection for pc_id: {pc_id}")
+        logger.info("🔄 Renegotiating connection for pc_id: {}", pc_id)
         await pipecat_connection.renegotiate(
             sdp=request["sdp"],
             type=request.get("type", "offer"),
@@ -1417,38 +2560,35 @@ async def api_offer_patch(request: dict):
 
 
 @app.get("/assistants")
-async def list_assistants(request: Request):
+async def list_assistants(request: Request, enrich: bool = False):
     """List available LangGraph assistants.
     
+    Args:
+        request: Incoming request (its Authorization header is forwarded)
+        enrich: Also fetch each assistant's details (name, description,
+            metadata); the list entries alone are enough for a dropdown
+    
     Returns:
         List of assistant configurations with display names
     """
-    import requests
-    
-    # Custom display name mappings
-    DISPLAY_NAME_OVERRIDES = {
-        "ace-base-agent": "ACE Base Agent",
-        "rbc-fees-agent": "Banking: Fee Agent",
-        "wire-transfer-agent": "Banking: Wire Transfer Agent",
-        "telco-agent": "Telco: Mobile Billing Agent",
-        "healthcare-agent": "Healthcare: Patient Intake",
-    }
-    
-    base_url = os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024").rstrip("/")
+    http: httpx.AsyncClient = request.app.state.http
+    base_url = CFG.langgraph_base_url.rstrip("/")
     
     # Auth handling
     inbound_auth = request.headers.get("authorization")
-    token = (
-        os.getenv("LANGGRAPH_AUTH_TOKEN")
-        or os.getenv("AUTH0_ACCESS_TOKEN")
-        or os.getenv("AUTH_BEARER_TOKEN")
-    )
+    token = CFG.langgraph_auth_token
     headers = (
         {"Authorization": inbound_auth}
         if inbound_auth
         else {"Authorization": f"Bearer {token}"} if token else None
     )
     
+    cache_key = (base_url, hash(headers["Authorization"]) if headers else None, enrich)
+    now = time.monotonic()
+    cached = _assistants_cache.get(cache_key)
+    if cached and now - cached[0] < ASSISTANTS_CACHE_TTL:
+        return ORJSONResponse(cached[1])
+    
     def normalize_entries(raw_items: list) -> list[dict]:
         """Normalize assistant entries from various API formats."""
         results: list[dict] = []
@@ -1468,26 +2608,29 @@ async def list_assistants(request: Request):
     
     # Try GET /assistants (newer LangGraph servers)
     items: list[dict] = []
+    use_search = False
     try:
-        resp = requests.get(
+        resp = await http.get(
             f"{base_url}/assistants",
             params={"limit": 100},
             timeout=8,
             headers=headers
         )
-        if resp.ok:
+        if resp.is_success:
             data = resp.json() or []
             if isinstance(data, dict):
                 data = data.get("items") or data.get("results") or data.get("assistants") or []
             items = normalize_entries(data)
-            logger.debug(f"Loaded {len(items)} assistants from GET /assistants")
+            logger.debug("Loaded {} assistants from GET /assistants", len(items))
+        # Older servers don't have the GET route at all
+        use_search = resp.status_code == 404
     except Exception as exc:
-        logger.warning(f"GET /assistants failed: {exc}")
+        logger.warning("GET /assistants failed: {}", exc)
     
     # Fallback: POST /assistants/search (older servers)
-    if not items:
+    if use_search:
         try:
-            resp = requests.post(
+            resp = await http.post(
                 f"{base_url}/assistants/search",
                 json={
                     "metadata": {},
@@ -1497,30 +2640,29 @@ async def list_assistants(request: Request):
                 timeout=10,
                 headers=headers,
             )
-            if resp.ok:
+            if resp.is_success:
                 data = resp.json() or []
                 if isinstance(data, dict):
                     data = data.get("items") or data.get("results") or []
                 items = normalize_entries(data)
-                logger.debug(f"Loaded {len(items)} assistants from POST /assistants/search")
+                logger.debug("Loaded {} assistants from POST /assistants/search", len(items))
         except Exception as exc:
-            logger.warning(f"POST /assistants/search failed: {exc}")
+            logger.warning("POST /assistants/search failed: {}", exc)
     
-    # Enrich with details
-    enriched: list[dict] = []
-    for item in items:
+    async def describe(item: dict) -> dict:
+        """Add a display name (and details, if enriching) to one entry."""
         detail = dict(item)
         assistant_id = detail.get("assistant_id")
         
-        if assistant_id:
+        if enrich and assistant_id:
             # Try to get more details
             try:
-                resp = requests.get(
+                resp = await http.get(
                     f"{base_url}/assistants/{assistant_id}",
                     timeout=5,
                     headers=headers
                 )
-                if resp.ok:
+                if resp.is_success:
                     d = resp.json() or {}
                     detail.update({
                         "graph_id": d.get("graph_id"),
@@ -1545,19 +2687,58 @@ async def list_assistants(request: Request):
             or assistant_id
         )
         detail["display_name"] = display_name
-        enriched.append(detail)
+        return detail
+    
+    # Enrich with details (all lookups in flight at once)
+    enriched = await asyncio.gather(*(describe(item) for item in items))
     
     # Filter out specific assistants if needed
-    exclude_list = os.getenv("EXCLUDE_ASSISTANTS", "").split(",")
-    if exclude_list:
-        enriched = [
-            agent for agent in enriched
-            if agent.get("assistant_id") not in exclude_list
-            and agent.get("graph_id") not in exclude_list
-        ]
+    exclude = CFG.exclude_assistants
+    enriched = [
+        agent for agent in enriched
+        if agent.get("assistant_id") not in exclude
+        and agent.get("graph_id") not in exclude
+    ]
+    
+    # Only cache real answers so a LangGraph outage isn't pinned for a minute
+    if items:
+        for key in [k for k, (fetched_at, _) in _assistants_cache.items() if now - fetched_at >= ASSISTANTS_CACHE_TTL]:
+            del _assistants_cache[key]
+        _assistants_cache[cache_key] = (now, enriched)
     
-    logger.info(f"Returning {len(enriched)} assistants")
-    return enriched
+    logger.info("Returning {} assistants", len(enriched))
+    return ORJSONResponse(enriched)
+
+
+def _handle_context_reset(pc_id: str, msg_content: str):
+    """Add a context-reset message from the UI to the context for the next turn."""
+    if not msg_content:
+        return
+    logger.info("Context reset request: {}", msg_content)
+    
+    # Add message to context for next turn
+    context = contexts_map.get(pc_id)
+    if context is not None:
+        context.add_message({"role": "user", "content": msg_content})
+    else:
+        logger.warning("No context found for pc_id: {}", pc_id)
+
+
+def _handle_text_input(pc_id: str, msg_content: str):
+    """Add typed text from the UI to the context."""
+    if not msg_content:
+        return
+    logger.info("Text input from UI: {}", msg_content)
+    context = contexts_map.get(pc_id)
+    if context is not None:
+        context.add_message({"role": "user", "content": msg_content})
+
+
+# /ws message type -> handler(pc_id, message text)
+_WS_MESSAGE_HANDLERS: dict[str, Callable[[str, str], None]] = {
+    "context_reset": _handle_context_reset,
+    "text_input": _handle_text_input,
+}
 
 
 @app.websocket("/ws")
@@ -1577,30 +2758,24 @@ async def websocket_endpoint(websocket: WebSocket):
         language_from_client = request.get("language")
         
         logger.info("=" * 80)
-        logger.info(f"📞 WebSocket /ws connection request received:")
-        logger.info(f"   • pc_id: {pc_id}")
-        logger.info(f"   • assistant: {assistant_from_client or 'None (using default)'}")
-        logger.info(f"   • language: {language_from_client or 'None (will use env variable)'}")
+        logger.info("📞 WebSocket /ws connection request received:")
+        logger.info("   • pc_id: {}", pc_id)
+        logger.info("   • assistant: {}", assistant_from_client or 'None (using default)')
+        logger.info("   • language: {}", language_from_client or 'None (will use env variable)')
         logger.info("=" * 80)
         
         if pc_id and pc_id in pcs_map:
             # Reuse existing connection (renegotiate)
             pipecat_connection = pcs_map[pc_id]
-            logger.info(f"Reusing existing connection for pc_id: {pc_id}")
+            logger.info("Reusing existing connection for pc_id: {}", pc_id)
             await pipecat_connection.renegotiate(sdp=request["sdp"], type=request["type"])
         else:
             # Create new WebRTC connection
-            ice_servers = build_server_ice_servers()
+            ice_servers = await build_server_ice_servers()
             pipecat_connection = SmallWebRTCConnection(ice_servers)
+            pipecat_connection.add_event_handler("closed", _on_connection_closed)
             await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
             
-            # Setup disconnect handler
-            @pipecat_connection.event_handler("closed")
-            async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-                logger.info(f"Connection closed for pc_id: {webrtc_connection.pc_id}")
-                pcs_map.pop(webrtc_connection.pc_id, None)
-                contexts_map.pop(webrtc_connection.pc_id, None)
-            
             # Start bot pipeline
             asyncio.create_task(run_bot(pipecat_connection, websocket, assistant_from_client, language_from_client))
         
@@ -1611,45 +2786,31 @@ async def websocket_endpoint(websocket: WebSocket):
         
         # Keep connection alive and handle messages
         while True:
+            raw = None
             try:
-                message = await websocket.receive_text()
+                # Raw receive: the UI sends text frames, other clients may send
+                # binary; orjson parses either without a decode round-trip
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    logger.info("Client disconnected from WebSocket")
+                    break
+                raw = message.get("text") or message.get("bytes")
                 
                 # Parse JSON messages from UI
-                try:
-                    data = json.loads(message)
-                    msg_type = data.get("type")
-                    msg_content = data.get("message", "").strip()
-                    
-                    if msg_type == "context_reset" and msg_content:
-                        logger.info(f"Context reset request: {msg_content}")
-                        
-                        # Add message to context for next turn
-                        pc_id = pipecat_connection.pc_id
-                        if pc_id in contexts_map:
-                            context = contexts_map[pc_id]
-                            context.add_message({"role": "user", "content": msg_content})
-                        else:
-                            logger.warning(f"No context found for pc_id: {pc_id}")
-                    
-                    elif msg_type == "text_input" and msg_content:
-                        # Handle text input from UI
-                        logger.info(f"Text input from UI: {msg_content}")
-                        pc_id = pipecat_connection.pc_id
-                        if pc_id in contexts_map:
-                            context = contexts_map[pc_id]
-                            context.add_message({"role": "user", "content": msg_content})
-                
-                except json.JSONDecodeError:
-                    logger.debug(f"Non-JSON message received: {message}")
-                    
+                data = orjson.loads(raw)
+                handler = _WS_MESSAGE_HANDLERS.get(data.get("type"))
+                if handler:
+                    handler(pipecat_connection.pc_id, data.get("message", "").strip())
+            except orjson.JSONDecodeError:
+                logger.debug("Non-JSON message received: {}", raw)
             except Exception as e:
-                logger.error(f"Error processing WebSocket message: {e}")
+                logger.error("Error processing WebSocket message: {}", e)
                 break
     
     except WebSocketDisconnect:
         logger.info("Client disconnected from WebSocket")
     except Exception as e:
-        logger.error(f"WebSocket endpoint error: {e}")
+        logger.error("WebSocket endpoint error: {}", e)
         raise
 
 
@@ -1671,10 +2832,10 @@ async def rtc_config():
     uses environment variables. Always includes public STUN fallback.
     """
     try:
-        servers = build_client_ice_servers()
+        servers = await build_client_ice_servers()
         return {"iceServers": servers}
     except Exception as e:
-        logger.error(f"rtc-config error: {e}")
+        logger.error("rtc-config error: {}", e)
         # Safe fallback
         return {"iceServers": [{"urls": "stun:stun.l.google.com:19302"}]}
 
@@ -1696,39 +2857,31 @@ async def health_check():
 app.mount("/client", SmallWebRTCPrebuiltUI)
 logger.info("📺 Pipecat standard UI mounted at /client")
 
-# Mount custom UI at /app (not at / to avoid intercepting /client)
+# Mount custom UI at /app (not at / to avoid intercepting /client).
+# Behind nginx/Caddy, serve ui/dist from the proxy instead (gzip_static /
+# precompressed) and these .gz/.br siblings are picked up there too.
 UI_DIST_DIR = Path(__file__).parent / "ui" / "dist"
 if UI_DIST_DIR.exists():
-    app.mount("/app", StaticFiles(directory=str(UI_DIST_DIR), html=True), name="custom-ui")
-    logger.info(f"📁 Custom UI serving from: {UI_DIST_DIR} at /app")
-    logger.info(f"📱 Access custom UI at: http://localhost:7860/app")
+    precompressed = precompress_static_files(UI_DIST_DIR)
+    if precompressed:
+        logger.info("🗜️  Precompressed {} UI assets", precompressed)
+    app.mount("/app", CachedStaticFiles(directory=str(UI_DIST_DIR), html=True), name="custom-ui")
+    logger.info("📁 Custom UI serving from: {} at /app", UI_DIST_DIR)
+    logger.info("📱 Access custom UI at: http://localhost:7860/app")
 else:
-    logger.warning(f"Custom UI directory not found: {UI_DIST_DIR}")
+    logger.warning("Custom UI directory not found: {}", UI_DIST_DIR)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Modern Voice Agent with LangGraph + Riva")
-    parser.add_argument("--host", default="0.0.0.0", help="Host address (default: 0.0.0.0)")
-    parser.add_argument("--port", type=int, default=7860, help="Port number (default: 7860)")
-    parser.add_argument("--verbose", "-v", action="count", default=0, help="Increase logging verbosity")
-    args = parser.parse_args()
-    
-    # Configure logging
-    logger.remove(0)
-    if args.verbose >= 2:
-        logger.add(sys.stderr, level="TRACE")
-    elif args.verbose >= 1:
-        logger.add(sys.stderr, level="DEBUG")
-    else:
-        logger.add(sys.stderr, level="INFO")
+    args = parse_args("Modern Voice Agent with LangGraph + Riva")
+    configure_logging(args.verbose)
     
     # Check required environment variables
     # Need either a shared NVIDIA_API_KEY or separate ASR/TTS keys
-    has_shared_key = os.getenv("NVIDIA_API_KEY")
-    has_asr_key = os.getenv("NVIDIA_ASR_API_KEY") or has_shared_key
-    has_tts_key = os.getenv("NVIDIA_TTS_API_KEY") or has_shared_key
+    asr_key = CFG.asr_api_key
+    tts_key = CFG.tts_api_key
     
-    if not has_asr_key or not has_tts_key:
+    if not asr_key or not tts_key:
         logger.error("❌ Missing required NVIDIA API keys")
         logger.error("   Option 1: Set a shared key for both services:")
         logger.error("     NVIDIA_API_KEY=nvapi-your-key-here")
@@ -1737,32 +2890,16 @@ if __name__ == "__main__":
         logger.error("     NVIDIA_TTS_API_KEY=nvapi-your-tts-key-here")
         sys.exit(1)
     
-    logger.info("=" * 70)
-    logger.info("🎙️  Modern Voice Agent")
-    logger.info("=" * 70)
-    
-    # Show LLM mode
-    use_simple = os.getenv("USE_SIMPLE_LLM", "false").lower() == "true"
-    if use_simple:
-        logger.info(f"LLM: OpenAI {os.getenv('OPENAI_MODEL', 'gpt-4o-mini')} (simple mode)")
-    else:
-        logger.info(f"LLM: LangGraph @ {os.getenv('LANGGRAPH_BASE_URL', 'http://127.0.0.1:2024')}")
-    
-    # Show API key info (separate keys or shared)
-    asr_key = os.getenv('NVIDIA_ASR_API_KEY') or os.getenv('NVIDIA_API_KEY', '')
-    tts_key = os.getenv('NVIDIA_TTS_API_KEY') or os.getenv('NVIDIA_API_KEY', '')
-    
-    if asr_key:
-        logger.info(f"NVIDIA ASR Key: {asr_key[:4]}...{asr_key[-4:]}")
-    if tts_key and tts_key != asr_key:
-        logger.info(f"NVIDIA TTS Key: {tts_key[:4]}...{tts_key[-4:]}")
-    elif tts_key == asr_key:
-        logger.info(f"NVIDIA TTS Key: (same as ASR)")
-    
-    logger.info(f"Sample Rate: {os.getenv('AUDIO_SAMPLE_RATE', '16000')}Hz")
-    logger.info("=" * 70)
-    logger.info(f"🌐 Server starting on http://{args.host}:{args.port}")
-    logger.info("=" * 70)
+    log_banner("🎙️  Modern Voice Agent", {
+        # Show LLM mode
+        "LLM": (
+            f"OpenAI {CFG.openai_model} (simple mode)" if CFG.use_simple_llm
+            else f"LangGraph @ {CFG.langgraph_base_url}"
+        ),
+        # Show API key info (separate keys or shared)
+        "NVIDIA ASR Key": CFG.asr_api_key_masked,
+        "NVIDIA TTS Key": "(same as ASR)" if tts_key == asr_key else CFG.tts_api_key_masked,
+        "Sample Rate": f"{CFG.sample_rate}Hz",
+    })
     
-    uvicorn.run(app, host=args.host, port=args.port)
-
+    serve(app, args.host, args.port, access_log=_env_flag("ACCESS_LOG"))
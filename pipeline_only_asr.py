@@ -23,20 +23,24 @@ Architecture Notes:
 - Transcriptions appear in browser console and can be captured via RTVI events
 """
 
-import argparse
 import asyncio
+import itertools
 import json
 import os
 import sys
-import uuid
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-import uvicorn
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from loguru import logger
 from pipecat_ai_small_webrtc_prebuilt.frontend import SmallWebRTCPrebuiltUI
 
@@ -62,21 +66,104 @@ from pipecat.transports.smallwebrtc.connection import (
 from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
 
-load_dotenv(override=True)
+from _riva_channels import shared_riva_auth, use_shared_riva_channel
+from _startup import configure_logging, log_banner, parse_args, serve
 
-app = FastAPI()
+# Only when run as a script: importing the module (tests, tooling) leaves
+# os.environ alone. Config below is read right after, at import.
+if __name__ == "__main__":
+    load_dotenv(override=True)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Read a "true"/"false" environment variable."""
+    return os.getenv(name, default).lower() == "true"
+
+
+def _mask_key(key: Optional[str]) -> str:
+    """Loggable form of an API key: first and last 4 characters."""
+    return f"{key[:4]}...{key[-4:]}" if key else "<unset>"
+
+
+@dataclass(frozen=True, slots=True)
+class AsrConfig:
+    """Process-wide ASR-only configuration, read from the environment once at import.
+    
+    run_asr_only reads these attributes instead of calling os.getenv per
+    connection. The client's language override is applied on top.
+    """
+    sample_rate: int
+    asr_language: str
+    asr_api_key: Optional[str]
+    asr_api_key_masked: str
+    asr_function_id: str
+    asr_model: str
+    asr_url: str
+    asr_custom_config: str
+    asr_custom_config_multi: str
+    asr_auto_punctuation: bool
+    asr_profanity_filter: bool
+    share_riva_channels: bool
+    turn_url: Optional[str]
+    turn_username: Optional[str]
+    turn_password: Optional[str]
+    webrtc_pool_size: int
+    ice_gather_timeout: float
+    ice_allowed_ifaces: frozenset[str]
+    ice_disable_ipv6: bool
+    
+    @classmethod
+    def from_env(cls) -> "AsrConfig":
+        """Build the configuration from environment variables."""
+        asr_api_key = os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY")
+        custom_config = os.getenv(
+            "RIVA_ASR_CUSTOM_CONFIG",
+            "enable_vad_endpointing:true,neural_vad.onset:0.65,apply_partial_itn:true"
+        )
+        return cls(
+            sample_rate=int(os.getenv("AUDIO_SAMPLE_RATE", "16000")),
+            asr_language=os.getenv("RIVA_ASR_LANGUAGE", "en-US"),
+            asr_api_key=asr_api_key,
+            # Masked once here for the setup logs
+            asr_api_key_masked=_mask_key(asr_api_key),
+            asr_function_id=os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409"),
+            asr_model=os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble"),
+            asr_url=os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443"),
+            asr_custom_config=custom_config,
+            # Same config with Riva's automatic language detection turned on
+            asr_custom_config_multi=",".join(
+                filter(None, (custom_config, "enable_automatic_language_detection:true"))
+            ),
+            asr_auto_punctuation=_env_flag("RIVA_ASR_AUTO_PUNCTUATION", "true"),
+            asr_profanity_filter=_env_flag("RIVA_ASR_PROFANITY_FILTER"),
+            share_riva_channels=_env_flag("RIVA_SHARED_CHANNEL", "true"),
+            turn_url=os.getenv("TURN_SERVER_URL") or os.getenv("TURN_URL"),
+            turn_username=os.getenv("TURN_USERNAME") or os.getenv("TURN_USER"),
+            turn_password=os.getenv("TURN_PASSWORD") or os.getenv("TURN_PASS"),
+            # Idle peer connections kept ready for new offers; 0 builds on demand
+            webrtc_pool_size=max(0, int(os.getenv("WEBRTC_POOL_SIZE", "4"))),
+            # Longest wait for STUN/TURN candidates before the SDP answer goes out
+            ice_gather_timeout=float(os.getenv("WEBRTC_ICE_GATHER_TIMEOUT", "2.0")),
+            # Host candidates: only these interfaces (empty = all), optionally IPv4 only
+            ice_allowed_ifaces=frozenset(
+                name.strip() for name in os.getenv("WEBRTC_ALLOWED_IFACES", "").split(",") if name.strip()
+            ),
+            ice_disable_ipv6=_env_flag("WEBRTC_DISABLE_IPV6"),
+        )
+
+
+CFG = AsrConfig.from_env()
 
 # Store active connections
 pcs_map: dict[str, SmallWebRTCConnection] = {}
 
+# Connections whose ICE state stays failed/disconnected this long are dropped
+STALE_CONNECTION_SECS = 30.0
+SWEEP_INTERVAL_SECS = 10.0
+
+# Per-process stream ids for log correlation (no urandom syscall per session)
+_stream_counter = itertools.count()
+
 
 # NOTE: Custom FrameProcessor for transcriptions removed due to Pipecat StartFrame issue
 # The FrameProcessor base class validates StartFrame receipt before allowing
@@ -90,42 +177,51 @@ pcs_map: dict[str, SmallWebRTCConnection] = {}
 # via the RTVI client's transcription events.
 
 
-def get_language_from_string(lang_str: str):
-    """Convert language string to Language enum.
+# Lowercased codes, so lookups accept any casing from the client or env.
+# Values are (STT language, auto-detect); "multi" uses EN_US as a placeholder
+# since Riva detects the language itself.
+_LANGUAGE_MAP: dict[str, tuple[Language, bool]] = {
+    "multi": (Language.EN_US, True),
+    "en-us": (Language.EN_US, False),
+    "en-gb": (Language.EN_GB, False),
+    "es-es": (Language.ES, False),
+    "es-us": (Language.ES_US, False),
+    "fr-fr": (Language.FR, False),
+    "de-de": (Language.DE, False),
+    "it-it": (Language.IT, False),
+    "pt-br": (Language.PT_BR, False),
+    "ja-jp": (Language.JA, False),
+    "ko-kr": (Language.KO, False),
+    "zh-cn": (Language.ZH, False),
+}
+_DEFAULT_LANGUAGE = (Language.EN_US, False)
+
+
+def get_language_from_string(lang_str: str) -> tuple[Language, bool]:
+    """Convert language string to Language enum and auto-detection flag.
     
     Args:
         lang_str: Language code like "en-US", "es-ES", "multi"
         
     Returns:
-        Language enum value, or "multi" for auto-detection
+        (Language for the STT params, whether multi-language detection is on)
     """
-    if lang_str.lower() == "multi":
-        return "multi"
-    
-    mapping = {
-        "en-US": Language.EN_US,
-        "en-GB": Language.EN_GB,
-        "es-ES": Language.ES,
-        "es-US": Language.ES_US,
-        "fr-FR": Language.FR,
-        "de-DE": Language.DE,
-        "it-IT": Language.IT,
-        "pt-BR": Language.PT_BR,
-        "ja-JP": Language.JA,
-        "ko-KR": Language.KO,
-        "zh-CN": Language.ZH,
-    }
-    return mapping.get(lang_str, Language.EN_US)
+    return _LANGUAGE_MAP.get(lang_str.lower(), _DEFAULT_LANGUAGE)
 
 
+@lru_cache(maxsize=1)
 def build_client_ice_servers() -> list[dict]:
-    """Build ICE servers for client using env vars."""
+    """Build ICE servers for client using env vars.
+    
+    The TURN settings are fixed for the process, so the list is built once;
+    callers share it and must not mutate it.
+    """
     servers: list[dict] = []
     
-    # Check for TURN server in env
-    turn_url = os.getenv("TURN_SERVER_URL") or os.getenv("TURN_URL")
-    turn_user = os.getenv("TURN_USERNAME") or os.getenv("TURN_USER")
-    turn_pass = os.getenv("TURN_PASSWORD") or os.getenv("TURN_PASS")
+    # TURN server from env
+    turn_url = CFG.turn_url
+    turn_user = CFG.turn_username
+    turn_pass = CFG.turn_password
     
     if turn_url:
         server: dict = {"urls": turn_url}
@@ -158,6 +254,232 @@ def build_server_ice_servers() -> list[IceServer]:
     return out
 
 
+def _cap_ice_gather_timeout(seconds: float) -> bool:
+    """Bound how long aioice waits for server-reflexive and relay candidates.
+    
+    aiortc has no trickle ICE: the SDP answer embeds every local candidate,
+    so get_answer() is only ready once gathering ends. aioice waits up to 5s
+    per component for STUN/TURN replies; an unreachable server costs the
+    full wait on every call. Candidates that arrive in time are kept, and
+    host candidates are never affected.
+    
+    Args:
+        seconds: Maximum wait for STUN/TURN candidates
+        
+    Returns:
+        True if the timeout was applied
+    """
+    try:
+        from aioice import Connection as IceConnection
+    except ImportError:
+        return False
+    gather = IceConnection.get_component_candidates
+    if gather.__defaults__ is None or len(gather.__defaults__) != 1:
+        logger.warning("⚠️ Unexpected aioice signature, keeping the default ICE gather timeout")
+        return False
+    gather.__defaults__ = (seconds,)
+    return True
+
+
+_cap_ice_gather_timeout(CFG.ice_gather_timeout)
+
+
+def _restrict_ice_host_addresses(allowed_ifaces: frozenset[str], disable_ipv6: bool) -> bool:
+    """Limit the local addresses aioice gathers host candidates on.
+    
+    Every host address gets its own UDP socket, candidate and (for IPv4) a
+    STUN query, and docker bridges, VPN tunnels and IPv6 addresses are
+    rarely reachable by the browser. aioice reads its address list from
+    aioice.ice.get_host_addresses on each gather, so that is replaced with
+    a filtered version.
+    
+    Args:
+        allowed_ifaces: Interface names to use (e.g. {"eth0"}); empty allows all
+        disable_ipv6: Skip IPv6 addresses
+        
+    Returns:
+        True if a filter was installed
+    """
+    if not allowed_ifaces and not disable_ipv6:
+        return False
+    try:
+        import ifaddr
+        from aioice import ice
+    except ImportError:
+        return False
+    
+    def get_host_addresses(use_ipv4: bool, use_ipv6: bool) -> list[str]:
+        addresses = []
+        for adapter in ifaddr.get_adapters():
+            if allowed_ifaces and adapter.name not in allowed_ifaces:
+                continue
+            for ip in adapter.ips:
+                if isinstance(ip.ip, str):
+                    if use_ipv4 and ip.ip != "127.0.0.1":
+                        addresses.append(ip.ip)
+                elif use_ipv6 and not disable_ipv6 and ip.ip[0] != "::1" and ip.ip[2] == 0:
+                    addresses.append(ip.ip[0])
+        return addresses
+    
+    ice.get_host_addresses = get_host_addresses
+    logger.info(
+        "🌐 ICE host candidates: interfaces={}, ipv6={}",
+        sorted(allowed_ifaces) or "all",
+        "off" if disable_ipv6 else "on",
+    )
+    return True
+
+
+_restrict_ice_host_addresses(CFG.ice_allowed_ifaces, CFG.ice_disable_ipv6)
+
+
+async def _on_connection_closed(webrtc_connection: SmallWebRTCConnection):
+    """Drop a closed connection from pcs_map (registered once per connection)."""
+    logger.info("Connection closed: {}", webrtc_connection.pc_id)
+    pcs_map.pop(webrtc_connection.pc_id, None)
+
+
+class ConnectionPool:
+    """Pre-built SmallWebRTCConnections handed out to new offers.
+    
+    Building a connection creates its RTCPeerConnection, transceiver
+    listeners and ICE server list. The pool does that ahead of time so an
+    offer only pays for answering. aiortc can only gather ICE candidates
+    once it has the remote offer, so gathering still happens per offer.
+    
+    Example:
+        pool = ConnectionPool(size=4)
+        pool.refill()                  # at startup
+        connection = pool.acquire()
+        await connection.initialize(sdp=sdp, type="offer")
+    """
+    
+    def __init__(self, size: int):
+        """Initialize the pool.
+        
+        Args:
+            size: Number of idle connections to keep ready (0 disables the pool)
+        """
+        self._size = size
+        self._idle: deque[SmallWebRTCConnection] = deque()
+        self._ice_servers: Optional[list[IceServer]] = None
+    
+    def _build(self) -> SmallWebRTCConnection:
+        """Create one connection against the configured ICE servers."""
+        if self._ice_servers is None:
+            self._ice_servers = build_server_ice_servers()
+        connection = SmallWebRTCConnection(self._ice_servers)
+        connection.add_event_handler("closed", _on_connection_closed)
+        return connection
+    
+    def refill(self):
+        """Build connections until the pool is full."""
+        while len(self._idle) < self._size:
+            self._idle.append(self._build())
+    
+    def acquire(self) -> SmallWebRTCConnection:
+        """Take an idle connection (or build one) and refill on the next loop turn."""
+        connection = self._idle.popleft() if self._idle else self._build()
+        asyncio.get_running_loop().call_soon(self.refill)
+        return connection
+    
+    async def close(self):
+        """Close every idle connection."""
+        while self._idle:
+            await self._idle.popleft().disconnect()
+
+
+connection_pool = ConnectionPool(size=CFG.webrtc_pool_size)
+
+
+# VAD configuration for voice activity detection (shared, never mutated)
+VAD_PARAMS = VADParams(
+    confidence=0.5,
+    start_secs=0.3,
+    stop_secs=1.0,
+    min_volume=0.5
+)
+
+# Silero analyzers returned by finished sessions, reused by the next ones.
+# Each carries one stream's model state, so a session gets its own analyzer.
+_idle_vad_analyzers: deque[SileroVADAnalyzer] = deque(maxlen=CFG.webrtc_pool_size)
+
+
+def acquire_vad_analyzer() -> SileroVADAnalyzer:
+    """Take an idle Silero analyzer, or load a new one if none is left."""
+    if _idle_vad_analyzers:
+        return _idle_vad_analyzers.pop()
+    return SileroVADAnalyzer(params=VAD_PARAMS)
+
+
+def release_vad_analyzer(vad_analyzer: SileroVADAnalyzer):
+    """Clear a finished session's stream state and keep the analyzer for reuse.
+    
+    Counters and the VAD state are reset by set_sample_rate() when the next
+    transport starts; the model's recurrent state and audio buffer are not.
+    """
+    vad_analyzer._model.reset_states()
+    vad_analyzer._vad_buffer = b""
+    vad_analyzer._prev_volume = 0
+    vad_analyzer._params = VAD_PARAMS
+    _idle_vad_analyzers.append(vad_analyzer)
+
+
+async def sweep_stale_connections():
+    """Drop connections whose "closed" event never fired.
+    
+    A client that crashes can leave its connection failed or disconnected
+    without a close. Every SWEEP_INTERVAL_SECS, entries that have stayed in
+    that state for STALE_CONNECTION_SECS are removed from pcs_map and
+    disconnected, so the map only holds live sessions.
+    """
+    stale_since: dict[str, float] = {}
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL_SECS)
+        now = time.monotonic()
+        for pc_id, connection in list(pcs_map.items()):
+            if connection.pc.iceConnectionState not in ("failed", "disconnected", "closed"):
+                stale_since.pop(pc_id, None)
+                continue
+            if now - stale_since.setdefault(pc_id, now) < STALE_CONNECTION_SECS:
+                continue
+            logger.warning("🧹 Dropping stale connection: {}", pc_id)
+            pcs_map.pop(pc_id, None)
+            stale_since.pop(pc_id, None)
+            try:
+                await connection.disconnect()
+            except Exception as e:
+                logger.warning("Error closing stale connection {}: {}", pc_id, e)
+        for pc_id in stale_since.keys() - pcs_map.keys():
+            del stale_since[pc_id]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-build peer connections and VAD analyzers, and start the stale-connection sweeper."""
+    connection_pool.refill()
+    for _ in range(CFG.webrtc_pool_size - len(_idle_vad_analyzers)):
+        _idle_vad_analyzers.append(await asyncio.to_thread(SileroVADAnalyzer, params=VAD_PARAMS))
+    logger.info("🔥 {} WebRTC connections and VAD analyzers ready", CFG.webrtc_pool_size)
+    sweeper = asyncio.create_task(sweep_stale_connections())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        await connection_pool.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
 async def run_asr_only(
     webrtc_connection: SmallWebRTCConnection, 
     ws: Optional[WebSocket] = None,
@@ -170,34 +492,27 @@ async def run_asr_only(
         ws: Optional WebSocket for transcription streaming
         language_override: Optional language code override
     """
-    stream_id = uuid.uuid4()
+    stream_id = f"{os.getpid()}-{next(_stream_counter)}"
     
     logger.info("=" * 80)
-    logger.info(f"🎤 Starting ASR-Only Pipeline (stream_id: {stream_id})")
+    logger.info("🎤 Starting ASR-Only Pipeline (stream_id: {})", stream_id)
     logger.info("=" * 80)
     
     # Get language configuration
-    env_language = os.getenv("RIVA_ASR_LANGUAGE", "en-US")
-    language_code = language_override or env_language
+    language_code = language_override or CFG.asr_language
     
-    logger.info(f"🌐 Language: {language_code}")
+    logger.info("🌐 Language: {}", language_code)
     
     # Transport configuration
-    sample_rate = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
-    
-    # VAD configuration for voice activity detection
-    vad_params = VADParams(
-        confidence=0.5,
-        start_secs=0.3,
-        stop_secs=1.0,
-        min_volume=0.5
-    )
+    sample_rate = CFG.sample_rate
+    
+    vad_analyzer = acquire_vad_analyzer()
     
     transport_params = TransportParams(
         audio_in_enabled=True,
         audio_in_sample_rate=sample_rate,
         audio_out_enabled=False,  # No audio output needed (no TTS)
-        vad_analyzer=SileroVADAnalyzer(params=vad_params),
+        vad_analyzer=vad_analyzer,
     )
     
     transport = SmallWebRTCTransport(
@@ -208,38 +523,30 @@ async def run_asr_only(
     # NVIDIA Riva STT Service
     logger.info("🎤 Creating Riva STT service...")
     
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY")
+    nvidia_api_key = CFG.asr_api_key
     if not nvidia_api_key:
         raise ValueError("NVIDIA_API_KEY or NVIDIA_ASR_API_KEY required")
     
-    asr_function_id = os.getenv("NVIDIA_ASR_FUNCTION_ID", "52b117d2-6c15-4cfa-a905-a67013bee409")
-    asr_model_name = os.getenv("RIVA_ASR_MODEL", "parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble")
-    asr_server = os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443")
+    asr_function_id = CFG.asr_function_id
+    asr_model_name = CFG.asr_model
+    asr_server = CFG.asr_url
     
-    logger.info(f"   🔑 API Key: {nvidia_api_key[:10]}...{nvidia_api_key[-8:]}")
-    logger.info(f"   🆔 Function ID: {asr_function_id}")
-    logger.info(f"   🖥️  Server: {asr_server}")
-    logger.info(f"   📦 Model: {asr_model_name}")
-    logger.info(f"   🎵 Sample rate: {sample_rate}Hz")
+    logger.info("   🔑 API Key: {}", CFG.asr_api_key_masked)
+    logger.info("   🆔 Function ID: {}", asr_function_id)
+    logger.info("   🖥️  Server: {}", asr_server)
+    logger.info("   📦 Model: {}", asr_model_name)
+    logger.info("   🎵 Sample rate: {}Hz", sample_rate)
     
-    stt_language = get_language_from_string(language_code)
-    enable_language_detection = stt_language == "multi"
-    
-    # For multi-language, use EN_US as placeholder (Riva auto-detects)
-    stt_params_language = Language.EN_US if enable_language_detection else stt_language
-    
-    # Custom configuration
-    custom_config = os.getenv("RIVA_ASR_CUSTOM_CONFIG", 
-                              "enable_vad_endpointing:true,neural_vad.onset:0.65,apply_partial_itn:true")
+    # For multi-language the language is an EN_US placeholder (Riva auto-detects)
+    stt_params_language, enable_language_detection = get_language_from_string(language_code)
     
+    # Custom configuration (both variants prebuilt in AsrConfig)
     if enable_language_detection:
-        if custom_config:
-            custom_config += ",enable_automatic_language_detection:true"
-        else:
-            custom_config = "enable_automatic_language_detection:true"
+        custom_config = CFG.asr_custom_config_multi
         logger.info("   🌐 Multi-language auto-detection enabled")
     else:
-        logger.info(f"   🎯 Single language mode: {language_code}")
+        custom_config = CFG.asr_custom_config
+        logger.info("   🎯 Single language mode: {}", language_code)
     
     stt = RivaSTTService(
         api_key=nvidia_api_key,
@@ -254,11 +561,21 @@ async def run_asr_only(
         ),
         custom_configuration=custom_config,
         interim_results=True,
-        automatic_punctuation=os.getenv("RIVA_ASR_AUTO_PUNCTUATION", "true").lower() == "true",
-        profanity_filter=os.getenv("RIVA_ASR_PROFANITY_FILTER", "false").lower() == "true",
+        automatic_punctuation=CFG.asr_auto_punctuation,
+        profanity_filter=CFG.asr_profanity_filter,
     )
     
-    logger.info(f"   ✅ Riva STT Service created")
+    if CFG.share_riva_channels:
+        try:
+            shared = use_shared_riva_channel(
+                getattr(stt, "_asr_service", None),
+                shared_riva_auth(asr_server, asr_function_id, nvidia_api_key),
+            )
+            logger.debug("   🔗 STT shared gRPC channel: {}", shared)
+        except Exception as e:
+            logger.warning("⚠️ Could not share STT gRPC channel: {}", e)
+    
+    logger.info("   ✅ Riva STT Service created")
     
     # Build pipeline - JUST STT, no custom processors
     # Following pipeline_modern.py pattern to avoid StartFrame issues
@@ -298,11 +615,14 @@ async def run_asr_only(
         await rtvi.set_bot_ready()
     
     pc_id = webrtc_connection.pc_id
-    logger.info(f"✅ ASR pipeline ready (pc_id: {pc_id})")
+    logger.info("✅ ASR pipeline ready (pc_id: {})", pc_id)
     
     # Run the pipeline
     runner = PipelineRunner(handle_sigint=False)
-    await runner.run(task)
+    try:
+        await runner.run(task)
+    finally:
+        release_vad_analyzer(vad_analyzer)
     
     # Pipeline complete
     logger.info("=" * 80)
@@ -310,56 +630,76 @@ async def run_asr_only(
     logger.info("=" * 80)
 
 
+# Running ASR sessions (the event loop only keeps weak references to tasks)
+_asr_tasks: set[asyncio.Task] = set()
+
+
+def _on_asr_task_done(task: asyncio.Task):
+    """Drop a finished ASR task and log its exception, if any."""
+    _asr_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error("ASR task {} failed", task.get_name())
+
+
+def launch_asr(pc_id: str, *args) -> asyncio.Task:
+    """Start a tracked ASR pipeline task for a connection.
+    
+    Args:
+        pc_id: Connection id, used for the task name
+        *args: Positional arguments for run_asr_only
+        
+    Returns:
+        The created task
+    """
+    task = asyncio.create_task(run_asr_only(*args), name=f"asr-{pc_id}")
+    _asr_tasks.add(task)
+    task.add_done_callback(_on_asr_task_done)
+    return task
+
+
 @app.post("/api/offer")
 async def api_offer(
     request: dict,
-    background_tasks: BackgroundTasks,
     language: Optional[str] = None
 ):
     """Handle WebRTC offer from client.
     
     Args:
         request: WebRTC offer with pc_id, sdp, type
-        background_tasks: FastAPI background tasks
         language: Optional language code
         
     Returns:
         WebRTC answer
     """
-    logger.info(f"📞 /api/offer - language: {language}")
+    logger.info("📞 /api/offer - language: {}", language)
     
     pc_id = request.get("pc_id")
     language_from_client = language or request.get("language")
     
-    if pc_id and pc_id in pcs_map:
+    new_connection = not (pc_id and pc_id in pcs_map)
+    if not new_connection:
         # Reuse existing connection
         pipecat_connection = pcs_map[pc_id]
-        logger.info(f"Reusing connection: {pc_id}")
+        logger.info("Reusing connection: {}", pc_id)
         await pipecat_connection.renegotiate(
             sdp=request["sdp"],
             type=request["type"],
             restart_pc=request.get("restart_pc", False),
         )
     else:
-        # Create new connection
-        ice_servers = build_server_ice_servers()
-        pipecat_connection = SmallWebRTCConnection(ice_servers)
+        # Take a pre-built connection
+        pipecat_connection = connection_pool.acquire()
         await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
-        
-        # Disconnect handler
-        @pipecat_connection.event_handler("closed")
-        async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-            logger.info(f"Connection closed: {webrtc_connection.pc_id}")
-            pcs_map.pop(webrtc_connection.pc_id, None)
-        
-        # Start ASR pipeline in background
-        background_tasks.add_task(run_asr_only, pipecat_connection, None, language_from_client)
     
-    # Return answer
+    # Register the answer first, then start the session
     answer = pipecat_connection.get_answer()
     pcs_map[answer["pc_id"]] = pipecat_connection
     
-    return JSONResponse(answer)
+    if new_connection:
+        # Long-lived session: its own task, not a post-response BackgroundTask
+        launch_asr(answer["pc_id"], pipecat_connection, None, language_from_client)
+    
+    return ORJSONResponse(answer)
 
 
 @app.patch("/api/offer")
@@ -368,7 +708,7 @@ async def api_offer_patch(request: dict):
     pc_id = request.get("pc_id")
     
     if not pc_id or pc_id not in pcs_map:
-        return JSONResponse({"error": "Connection not found"}, status_code=404)
+        return ORJSONResponse({"error": "Connection not found"}, status_code=404)
     
     pipecat_connection = pcs_map[pc_id]
     
@@ -382,9 +722,9 @@ async def api_offer_patch(request: dict):
             restart_pc=request.get("restart_pc", False),
         )
         answer = pipecat_connection.get_answer()
-        return JSONResponse(answer)
+        return ORJSONResponse(answer)
     
-    return JSONResponse({"status": "ok"})
+    return ORJSONResponse({"status": "ok"})
 
 
 @app.websocket("/ws")
@@ -398,61 +738,68 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Receive connection request
-        request = await websocket.receive_json()
+        request = orjson.loads(await websocket.receive_text())
         pc_id = request.get("pc_id")
         language_from_client = request.get("language")
         
-        logger.info(f"📞 WebSocket connection - language: {language_from_client}")
+        logger.info("📞 WebSocket connection - language: {}", language_from_client)
         
         if pc_id and pc_id in pcs_map:
             # Reuse connection
             pipecat_connection = pcs_map[pc_id]
             await pipecat_connection.renegotiate(sdp=request["sdp"], type=request["type"])
         else:
-            # New connection
-            ice_servers = build_server_ice_servers()
-            pipecat_connection = SmallWebRTCConnection(ice_servers)
+            # New connection (pre-built)
+            pipecat_connection = connection_pool.acquire()
             await pipecat_connection.initialize(sdp=request["sdp"], type=request["type"])
             
-            # Disconnect handler
-            @pipecat_connection.event_handler("closed")
-            async def handle_disconnected(webrtc_connection: SmallWebRTCConnection):
-                logger.info(f"Connection closed: {webrtc_connection.pc_id}")
-                pcs_map.pop(webrtc_connection.pc_id, None)
-            
             # Start ASR pipeline with WebSocket
-            asyncio.create_task(run_asr_only(pipecat_connection, websocket, language_from_client))
+            launch_asr(pipecat_connection.pc_id, pipecat_connection, websocket, language_from_client)
         
         # Send answer
         answer = pipecat_connection.get_answer()
         pcs_map[answer["pc_id"]] = pipecat_connection
-        await websocket.send_json(answer)
+        # Text frame: the prebuilt UI parses the answer from a string
+        await websocket.send_text(orjson.dumps(answer).decode())
         
-        # Keep connection alive
+        # Keep connection alive. Raw receive: no control messages are expected,
+        # so frames are only decoded into the debug log when it's enabled.
         while True:
             try:
-                message = await websocket.receive_text()
-                logger.debug(f"WebSocket message: {message}")
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    logger.info("Client disconnected")
+                    break
+                logger.debug("WebSocket message: {}", message.get("text") or message.get("bytes"))
             except Exception as e:
-                logger.error(f"WebSocket error: {e}")
+                logger.error("WebSocket error: {}", e)
                 break
     
     except WebSocketDisconnect:
         logger.info("Client disconnected")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: {}", e)
         raise
 
 
-@app.get("/rtc-config")
-async def rtc_config():
-    """Provide WebRTC ICE configuration."""
+def _build_rtc_config_body() -> bytes:
+    """Serialize the client ICE configuration (public STUN if it can't be built)."""
     try:
         servers = build_client_ice_servers()
-        return {"iceServers": servers}
     except Exception as e:
-        logger.error(f"rtc-config error: {e}")
-        return {"iceServers": [{"urls": "stun:stun.l.google.com:19302"}]}
+        logger.error("rtc-config error: {}", e)
+        servers = [{"urls": "stun:stun.l.google.com:19302"}]
+    return orjson.dumps({"iceServers": servers})
+
+
+# ICE servers come from env and are fixed for the process, so serialize once
+_RTC_CONFIG_BODY = _build_rtc_config_body()
+
+
+@app.get("/rtc-config")
+async def rtc_config():
+    """Provide WebRTC ICE configuration."""
+    return Response(content=_RTC_CONFIG_BODY, media_type="application/json")
 
 
 @app.get("/health")
@@ -462,7 +809,7 @@ async def health_check():
         "status": "healthy",
         "mode": "asr_only",
         "services": {
-            "riva_stt": os.getenv("RIVA_ASR_URL", "grpc.nvcf.nvidia.com:443"),
+            "riva_stt": CFG.asr_url,
         }
     }
 
@@ -473,45 +820,26 @@ logger.info("📺 Pipecat UI mounted at /")
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="ASR-Only Pipeline (No TTS)")
-    parser.add_argument("--host", default="0.0.0.0", help="Host (default: 0.0.0.0)")
-    parser.add_argument("--port", type=int, default=7860, help="Port (default: 7860)")
-    parser.add_argument("--verbose", "-v", action="count", default=0, help="Verbosity")
-    args = parser.parse_args()
-    
-    # Configure logging
-    logger.remove(0)
-    if args.verbose >= 2:
-        logger.add(sys.stderr, level="TRACE")
-    elif args.verbose >= 1:
-        logger.add(sys.stderr, level="DEBUG")
-    else:
-        logger.add(sys.stderr, level="INFO")
+    args = parse_args("ASR-Only Pipeline (No TTS)")
+    configure_logging(args.verbose)
     
     # Check API key
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY") or os.getenv("NVIDIA_ASR_API_KEY")
+    nvidia_api_key = CFG.asr_api_key
     if not nvidia_api_key:
         logger.error("❌ Missing NVIDIA_API_KEY or NVIDIA_ASR_API_KEY")
         sys.exit(1)
     
-    logger.info("=" * 70)
-    logger.info("🎤 ASR-Only Pipeline (No TTS)")
-    logger.info("=" * 70)
-    logger.info(f"API Key: {nvidia_api_key[:4]}...{nvidia_api_key[-4:]}")
-    logger.info(f"Sample Rate: {os.getenv('AUDIO_SAMPLE_RATE', '16000')}Hz")
-    logger.info(f"Language: {os.getenv('RIVA_ASR_LANGUAGE', 'en-US')}")
-    logger.info("=" * 70)
-    logger.info(f"🌐 Server: http://{args.host}:{args.port}")
-    logger.info("=" * 70)
-    logger.info("")
+    log_banner("🎤 ASR-Only Pipeline (No TTS)", {
+        "API Key": CFG.asr_api_key_masked,
+        "Sample Rate": f"{CFG.sample_rate}Hz",
+        "Language": CFG.asr_language,
+    })
     logger.info("📝 This pipeline does:")
     logger.info("   ✅ Speech-to-Text (ASR)")
     logger.info("   ✅ Transcription streaming")
     logger.info("   ❌ NO LLM (no AI responses)")
     logger.info("   ❌ NO TTS (no voice output)")
-    logger.info("")
     logger.info("Perfect for: transcription, captioning, dictation")
     logger.info("=" * 70)
     
-    uvicorn.run(app, host=args.host, port=args.port)
-
+    serve(app, args.host, args.port, access_log=_env_flag("ACCESS_LOG"))